@@ -2,9 +2,11 @@
 Viral Clip Analyzer - LLM-powered clip selection
 Uses AI to identify the most engaging moments based on topic and virality criteria.
 """
+import bisect
 import json
 import re
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, asdict
@@ -14,6 +16,19 @@ from rich.table import Table
 # Ollama - always available (local, no API key needed)
 OLLAMA_URL = "http://localhost:11434"
 
+# Ollama analysis runs on 5-minute transcript windows sent concurrently (the
+# server batches up to OLLAMA_NUM_PARALLEL requests) instead of one truncated
+# full-transcript prompt; the per-window picks are then merged and ranked
+OLLAMA_WINDOW_SECONDS = 300.0
+# Windows overlap by the longest clip the prompt asks for (90s), so a clip
+# that crosses a window boundary still fits entirely inside one window
+OLLAMA_WINDOW_OVERLAP = 90.0
+OLLAMA_CONCURRENCY = 4
+CLIPS_PER_WINDOW = 3
+
+# Keep the model resident between requests/runs instead of Ollama's 5 min idle unload
+OLLAMA_KEEP_ALIVE = "30m"
+
 try:
     import anthropic
     HAS_ANTHROPIC = True
@@ -149,27 +164,28 @@ IMPORTANT:
 
 def chunk_transcript_for_analysis(
     transcript: Transcript, 
-    chunk_duration: float = 300.0  # 5 minutes per chunk
+    chunk_duration: float = 300.0,  # 5 minutes per chunk
+    overlap: float = 0.0
 ) -> List[str]:
     """
     Break transcript into analyzable chunks with timestamps.
+    Chunks start every chunk_duration seconds and run `overlap` seconds into
+    the next one, so any span up to `overlap` long lies within one chunk.
     """
-    chunks = []
-    current_chunk = []
-    chunk_start = 0.0
+    segments = transcript.segments
+    if not segments:
+        return []
     
-    for seg in transcript.segments:
-        current_chunk.append(f"[{seg.start:.1f}s] {seg.text}")
-        
-        # Check if we've exceeded chunk duration
-        if seg.end - chunk_start >= chunk_duration:
-            chunks.append("\n".join(current_chunk))
-            current_chunk = []
-            chunk_start = seg.end
+    starts = [seg.start for seg in segments]
+    chunks = []
+    chunk_start = starts[0]
     
-    # Don't forget the last chunk
-    if current_chunk:
-        chunks.append("\n".join(current_chunk))
+    while chunk_start <= starts[-1]:
+        lo = bisect.bisect_left(starts, chunk_start)
+        hi = bisect.bisect_left(starts, chunk_start + chunk_duration + overlap)
+        if hi > lo:
+            chunks.append("\n".join(f"[{seg.start:.1f}s] {seg.text}" for seg in segments[lo:hi]))
+        chunk_start += chunk_duration
     
     return chunks
 
@@ -233,17 +249,8 @@ def analyze_with_gemini(
     return parse_clip_response(response.text)
 
 
-def analyze_with_ollama(
-    transcript_text: str,
-    topic: str,
-    num_clips: int = 5,
-    model: str = "llama3.1:8b"
-) -> List[ClipCandidate]:
-    """
-    Use Ollama for 100% free local LLM analysis.
-    Supports: llama3.1:8b, gemma2:9b, mistral:7b, etc.
-    """
-    # Check if Ollama is running
+def _check_ollama(model: str):
+    """Raise a helpful error if the Ollama server is not reachable"""
     try:
         r = requests.get(f"{OLLAMA_URL}/api/tags", timeout=5)
         r.raise_for_status()
@@ -252,22 +259,33 @@ def analyze_with_ollama(
             "Ollama not running! Start with: ollama serve\n"
             f"Then pull a model: ollama pull {model}"
         )
-    
-    prompt = VIRAL_ANALYSIS_PROMPT.format(
-        transcript_text=transcript_text[:15000],  # Limit for context window
-        topic=topic,
-        num_clips=num_clips
-    )
-    
-    console.print(f"[cyan]Analyzing with Ollama ({model})...[/cyan]")
-    console.print("[dim]This runs locally - no API costs![/dim]")
-    
+
+
+def preload_ollama_model(model: str = "llama3.1:8b") -> bool:
+    """
+    Load the model into memory ahead of analysis (an empty prompt only loads it).
+    Returns False if Ollama isn't reachable; analysis reports that error itself.
+    """
+    try:
+        r = requests.post(
+            f"{OLLAMA_URL}/api/generate",
+            json={"model": model, "prompt": "", "keep_alive": OLLAMA_KEEP_ALIVE},
+            timeout=300
+        )
+        r.raise_for_status()
+    except requests.exceptions.RequestException:
+        return False
+    return True
+
+
+def _ollama_generate(prompt: str, model: str) -> List[ClipCandidate]:
     response = requests.post(
         f"{OLLAMA_URL}/api/generate",
         json={
             "model": model,
             "prompt": prompt,
             "stream": False,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
             "options": {
                 "temperature": 0.7,
                 "num_predict": 4096
@@ -281,6 +299,60 @@ def analyze_with_ollama(
     return parse_clip_response(result["response"])
 
 
+def merge_clip_candidates(clips: List[ClipCandidate], num_clips: int) -> List[ClipCandidate]:
+    """Pick the top-scoring candidates, skipping any that overlap one already picked"""
+    ranked = sorted(clips, key=lambda c: (c.virality_score, c.topic_relevance), reverse=True)
+    
+    chosen = []
+    for clip in ranked:
+        if any(clip.start_time < c.end_time and c.start_time < clip.end_time for c in chosen):
+            continue
+        chosen.append(clip)
+        if len(chosen) == num_clips:
+            break
+    
+    return chosen
+
+
+def analyze_windows_with_ollama(
+    transcript: Transcript,
+    topic: str,
+    num_clips: int = 5,
+    model: str = "llama3.1:8b"
+) -> List[ClipCandidate]:
+    """
+    Analyze the transcript in windows with concurrent Ollama requests.
+    Many short prompts batch well and cover the whole transcript, where a
+    single prompt has to be truncated to fit the context window.
+    """
+    _check_ollama(model)
+    
+    windows = chunk_transcript_for_analysis(transcript, OLLAMA_WINDOW_SECONDS, OLLAMA_WINDOW_OVERLAP)
+    per_window = min(num_clips, CLIPS_PER_WINDOW)
+    
+    console.print(f"[cyan]Analyzing {len(windows)} transcript windows with Ollama ({model})...[/cyan]")
+    console.print("[dim]This runs locally - no API costs![/dim]")
+    
+    candidates = []
+    with ThreadPoolExecutor(max_workers=OLLAMA_CONCURRENCY) as executor:
+        futures = [
+            executor.submit(
+                _ollama_generate,
+                VIRAL_ANALYSIS_PROMPT.format(transcript_text=window, topic=topic, num_clips=per_window),
+                model
+            )
+            for window in windows
+        ]
+        for future in as_completed(futures):
+            try:
+                candidates.extend(future.result())
+            except (ValueError, KeyError, requests.exceptions.RequestException) as e:
+                # One failed or unparseable window shouldn't sink the whole analysis
+                console.print(f"[yellow]Skipping window with unusable response: {e}[/yellow]")
+    
+    return merge_clip_candidates(candidates, num_clips)
+
+
 def parse_clip_response(response_text: str) -> List[ClipCandidate]:
     """Parse the JSON response from LLM into ClipCandidate objects"""
     # Extract JSON from response (handle markdown code blocks)
@@ -347,7 +419,7 @@ def analyze_transcript(
     elif llm_provider == "gemini":
         clips = analyze_with_gemini(transcript_text, topic, num_clips, api_key)
     elif llm_provider == "ollama":
-        clips = analyze_with_ollama(transcript_text, topic, num_clips)
+        clips = analyze_windows_with_ollama(transcript, topic, num_clips)
     else:
         raise ValueError(f"Unknown LLM provider: {llm_provider}. Use: ollama, claude, or gemini")
     
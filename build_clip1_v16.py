@@ -38,6 +38,19 @@ OUTLINE_COLOR = "black"
 BOX_PADDING = 12
 WORDS_PER_LINE = 4
 
+# drawtext templates (filled per word with format_map)
+WHITE_TMPL = (
+    f"drawtext=text='{{text}}':fontfile='{FONT_PATH}':fontsize={FONT_SIZE}:"
+    f"fontcolor={TEXT_COLOR}:borderw=3:bordercolor={OUTLINE_COLOR}:"
+    "x={x}:y={y}:enable='between(t,{ls:.3f},{le:.3f})'"
+)
+HILITE_TMPL = (
+    f"drawtext=text='{{text}}':fontfile='{FONT_PATH}':fontsize={FONT_SIZE}:"
+    f"fontcolor={TEXT_COLOR}:borderw=3:bordercolor={OUTLINE_COLOR}:"
+    f"box=1:boxcolor={HIGHLIGHT_COLOR}@0.9:boxborderw={BOX_PADDING}:"
+    "x={x}:y={y}:enable='between(t,{ws:.3f},{we:.3f})'"
+)
+
 WORD_FIXES = {"lair": "Larry", "Lair": "Larry", "viral": "vial"}
 
 def fix_word(word: str) -> str:
@@ -132,33 +145,22 @@ def generate_highlight_filters(lines: List[List[Dict]]) -> str:
         positioned = calculate_line_positions(line, y)
         
         for word in positioned:
-            text = escape_text(word['text'])
+            fields = {
+                'text': escape_text(word['text']),
+                'x': word['x'], 'y': word['y'],
+                'ls': line_start, 'le': line_end,
+                'ws': word['start'], 'we': word['end'],
+            }
             
             # 1. Draw WHITE text (visible for entire line duration)
             # Use standard commas + quotes (works in filter script)
-            filters.append(
-                f"drawtext=text='{text}':"
-                f"fontfile='{FONT_PATH}':"
-                f"fontsize={FONT_SIZE}:"
-                f"fontcolor={TEXT_COLOR}:"
-                f"borderw=3:bordercolor={OUTLINE_COLOR}:"
-                f"x={word['x']}:y={word['y']}:"
-                f"enable='between(t,{line_start:.3f},{line_end:.3f})'"
-            )
+            filters.append(WHITE_TMPL.format_map(fields))
             
             # 2. Draw HIGHLIGHTED text with box (visible for word duration only)
-            # filters.append(
-            #     f"drawtext=text='{text}':"
-            #     f"fontfile='{FONT_PATH}':"
-            #     f"fontsize={FONT_SIZE}:"
-            #     f"fontcolor={TEXT_COLOR}:"
-            #     f"borderw=3:bordercolor={OUTLINE_COLOR}:"
-            #     f"box=1:boxcolor={HIGHLIGHT_COLOR}@0.9:boxborderw={BOX_PADDING}:"
-            #     f"x={word['x']}:y={word['y']}:"
-            #     f"enable='between(t,{word['start']:.3f},{word['end']:.3f})'"
-            # )
+            # filters.append(HILITE_TMPL.format_map(fields))
     
-    return ",".join(filters)
+    # One filter per line; the commas still chain them, newlines are just whitespace
+    return ",\n".join(filters)
 
 def extract_base_video(start: float, end: float, output: Path) -> Path:
     """Extract and crop video"""
@@ -168,10 +170,10 @@ def extract_base_video(start: float, end: float, output: Path) -> Path:
     raw_path = TEMP_DIR / "clip1_v16_raw.mp4"
     
     subprocess.run([
-        "ffmpeg", "-y", "-ss", str(start), "-i", str(VIDEO_PATH),
+        "ffmpeg", "-y", "-loglevel", "error", "-ss", str(start), "-i", str(VIDEO_PATH),
         "-t", str(duration), "-c:v", "libx264", "-preset", "fast", "-crf", "18",
         "-c:a", "aac", "-b:a", "192k", str(raw_path)
-    ], capture_output=True, check=True)
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
     
     res = subprocess.run([
         "ffprobe", "-v", "error", "-select_streams", "v:0",
@@ -183,11 +185,11 @@ def extract_base_video(start: float, end: float, output: Path) -> Path:
     crop_x = (w - crop_w) // 2
     
     subprocess.run([
-        "ffmpeg", "-y", "-i", str(raw_path),
+        "ffmpeg", "-y", "-loglevel", "error", "-i", str(raw_path),
         "-vf", f"crop={crop_w}:{h}:{crop_x}:0,scale={OUT_W}:{OUT_H}:force_original_aspect_ratio=decrease,pad={OUT_W}:{OUT_H}:(ow-iw)/2:(oh-ih)/2:black",
         "-c:v", "libx264", "-preset", "fast", "-crf", "18",
         "-c:a", "copy", str(output)
-    ], capture_output=True, check=True)
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
     
     console.print("  [green]✓ Extracted[/green]")
     return output
@@ -201,15 +203,16 @@ def render_with_highlights(video_path: Path, filter_str: str, output_path: Path)
     with open(filter_script_path, "w") as f:
         f.write(filter_str)
     
+    # Only errors go to stderr, so the pipe never fills up with progress lines
     cmd = [
-        "ffmpeg", "-y", "-i", str(video_path),
+        "ffmpeg", "-y", "-loglevel", "error", "-i", str(video_path),
         "-filter_script:v", str(filter_script_path),
         "-c:v", "libx264", "-preset", "fast", "-crf", "18",
         "-c:a", "copy",
         str(output_path)
     ]
     
-    result = subprocess.run(cmd, capture_output=True)
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=False)
     
     if result.returncode != 0:
         console.print(f"[red]Error: {result.stderr.decode()[:500]}[/red]")
@@ -27,6 +27,9 @@ class CaptionStyle:
     margin_v: int = 200                  # Vertical margin from bottom
     words_per_group: int = 3
 
+# Bump when generate_ass_subtitles output changes, so cached .ass files are rebuilt
+ASS_GENERATOR_VERSION = 1
+
 # Preset styles
 STYLES = {
     "hormozi": CaptionStyle(
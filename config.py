@@ -20,7 +20,7 @@ ASSETS_DIR.mkdir(exist_ok=True)
 class LLMConfig(BaseModel):
     """LLM provider configuration"""
     provider: str = "ollama"  # "ollama", "gemini", "claude"
-    ollama_model: str = "llama3.1:8b"  # or gemma2:9b, mistral:7b
+    ollama_model: str = "llama3.1:8b"  # Q4_K_M by default; or gemma2:9b, mistral:7b
     ollama_url: str = "http://localhost:11434"
 
 
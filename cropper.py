@@ -7,7 +7,6 @@ import numpy as np
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict
 from dataclasses import dataclass
-from collections import deque
 import subprocess
 import json
 from rich.console import Console
@@ -19,8 +18,65 @@ try:
 except ImportError:
     HAS_YOLO = False
 
+try:
+    import onnxruntime as ort
+    HAS_ORT = True
+except ImportError:
+    HAS_ORT = False
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so the smoothing kernel still runs as plain Python"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
 console = Console()
 
+# YOLOv8n exported for onnxruntime (`yolo export model=yolov8n.pt format=onnx`);
+# runs on CoreML (Neural Engine) / CUDA when those providers are available
+ONNX_MODEL_PATH = Path(__file__).parent / "assets" / "models" / "yolov8n.onnx"
+ONNX_INPUT_SIZE = 640
+ONNX_NMS_THRESHOLD = 0.45
+
+# Seconds between person detections; crops in between are interpolated
+DETECT_INTERVAL = 0.5
+# Span of the crop-center smoothing window, in seconds of video
+SMOOTHING_SECONDS = 2.5
+
+# Encoder settings for apply_smart_crop output (callers caching crops key on these)
+CROP_ENCODE_ARGS = [
+    "-c:v", "libx264", "-preset", "fast", "-crf", "18",
+    "-c:a", "aac", "-b:a", "192k",
+]
+
+
+@njit(cache=True)
+def _ema_weighted(history: np.ndarray, count: int, head: int) -> float:
+    """
+    Exponentially weighted mean of the last `count` samples in a ring buffer.
+    
+    Same weights as np.exp(np.linspace(-1, 0, count)), oldest sample first,
+    computed in a single pass with running weight/value sums.
+    """
+    size = history.shape[0]
+    start = (head - count) % size
+    step = 1.0 / (count - 1) if count > 1 else 0.0
+    
+    wsum = 0.0
+    vsum = 0.0
+    for i in range(count):
+        w = np.exp(-1.0 + i * step)
+        wsum += w
+        vsum += w * history[(start + i) % size]
+    
+    return vsum / wsum
+
 
 @dataclass
 class BoundingBox:
@@ -92,8 +148,10 @@ class SpeakerTracker:
             self.crop_width = source_width
             self.crop_height = int(source_width / self.target_aspect)
         
-        # History for smoothing
-        self.center_history: deque = deque(maxlen=smoothing_window)
+        # History for smoothing (ring buffer, contiguous for the JIT kernel)
+        self.center_history = np.empty(smoothing_window, dtype=np.float32)
+        self._history_head = 0
+        self._history_count = 0
         
         # Default to center
         self.last_center_x = source_width / 2
@@ -117,7 +175,9 @@ class SpeakerTracker:
             center_x = main_person.center_x
         
         # Add to history
-        self.center_history.append(center_x)
+        self.center_history[self._history_head] = center_x
+        self._history_head = (self._history_head + 1) % self.smoothing_window
+        self._history_count = min(self._history_count + 1, self.smoothing_window)
         
         # Smooth using exponential moving average
         smoothed_x = self._smooth_center()
@@ -145,26 +205,39 @@ class SpeakerTracker:
     
     def _smooth_center(self) -> float:
         """Apply temporal smoothing to center position"""
-        if len(self.center_history) == 0:
+        if self._history_count == 0:
             return self.source_width / 2
         
         # Exponential moving average
-        weights = np.exp(np.linspace(-1, 0, len(self.center_history)))
-        weights /= weights.sum()
-        
-        return np.average(list(self.center_history), weights=weights)
+        return float(_ema_weighted(self.center_history, self._history_count, self._history_head))
 
 
 class PersonDetector:
-    """Detects people in video frames using YOLOv8"""
+    """
+    Detects people in video frames using YOLOv8.
+    Runs the ONNX export through onnxruntime on CoreML/CUDA when the model file
+    and runtime are present, else the ultralytics (PyTorch) model on CPU.
+    """
     
     def __init__(self, model_name: str = "yolov8n.pt"):
+        self.person_class_id = 0  # COCO class 0 is 'person'
+        self.session = None
+        
+        if HAS_ORT and ONNX_MODEL_PATH.exists():
+            providers = [
+                p for p in ("CoreMLExecutionProvider", "CUDAExecutionProvider")
+                if p in ort.get_available_providers()
+            ] + ["CPUExecutionProvider"]
+            console.print(f"[cyan]Loading ONNX model: {ONNX_MODEL_PATH.name} ({providers[0]})[/cyan]")
+            self.session = ort.InferenceSession(str(ONNX_MODEL_PATH), providers=providers)
+            self.input_name = self.session.get_inputs()[0].name
+            return
+        
         if not HAS_YOLO:
             raise ImportError("ultralytics not installed. Run: pip install ultralytics")
         
         console.print(f"[cyan]Loading YOLO model: {model_name}[/cyan]")
         self.model = YOLO(model_name)
-        self.person_class_id = 0  # COCO class 0 is 'person'
         
     def detect(self, frame: np.ndarray, confidence_threshold: float = 0.5) -> List[BoundingBox]:
         """
@@ -177,6 +250,9 @@ class PersonDetector:
         Returns:
             List of BoundingBox for detected people
         """
+        if self.session is not None:
+            return self._detect_onnx(frame, confidence_threshold)
+        
         results = self.model(frame, verbose=False)
         
         detections = []
@@ -191,6 +267,37 @@ class PersonDetector:
                     ))
         
         return detections
+    
+    def _detect_onnx(self, frame: np.ndarray, confidence_threshold: float) -> List[BoundingBox]:
+        """Run the ONNX export and decode its (1, 84, N) output for the person class"""
+        h, w = frame.shape[:2]
+        blob = cv2.dnn.blobFromImage(
+            frame, 1 / 255.0, (ONNX_INPUT_SIZE, ONNX_INPUT_SIZE), swapRB=True, crop=False
+        )
+        output = self.session.run(None, {self.input_name: blob})[0][0]
+        
+        # Rows: cx, cy, w, h, then one score per COCO class
+        scores = output[4 + self.person_class_id]
+        keep = scores >= confidence_threshold
+        if not keep.any():
+            return []
+        
+        cx, cy, bw, bh = output[:4, keep]
+        scores = scores[keep]
+        sx, sy = w / ONNX_INPUT_SIZE, h / ONNX_INPUT_SIZE
+        boxes = np.stack([(cx - bw / 2) * sx, (cy - bh / 2) * sy, bw * sx, bh * sy], axis=1)
+        
+        indices = cv2.dnn.NMSBoxes(
+            boxes.tolist(), scores.tolist(), confidence_threshold, ONNX_NMS_THRESHOLD
+        )
+        return [
+            BoundingBox(
+                x1=float(boxes[i, 0]), y1=float(boxes[i, 1]),
+                x2=float(boxes[i, 0] + boxes[i, 2]), y2=float(boxes[i, 1] + boxes[i, 3]),
+                confidence=float(scores[i])
+            )
+            for i in np.asarray(indices).reshape(-1)
+        ]
 
 
 def generate_crop_trajectory(
@@ -199,11 +306,18 @@ def generate_crop_trajectory(
     end_time: float,
     output_width: int = 1080,
     output_height: int = 1920,
-    sample_rate: int = 5  # Process every Nth frame for speed
+    sample_rate: Optional[int] = None,  # Process every Nth frame (default: one per DETECT_INTERVAL)
+    decode_threads: Optional[int] = None
 ) -> List[Dict]:
     """
     Analyze video segment and generate crop trajectory.
     
+    Detection runs on one frame per sample_rate; the other frames are only
+    grabbed (no colour conversion) and their crop is interpolated between
+    samples. Grabbing sequentially beats CAP_PROP_POS_FRAMES seeks here: each
+    seek re-decodes from the previous keyframe, and sample strides are far
+    shorter than a GOP. For keyframe-accurate random access use PyAV instead.
+    
     Args:
         video_path: Path to source video
         start_time: Start time in seconds
@@ -211,24 +325,32 @@ def generate_crop_trajectory(
         output_width: Target width (9:16)
         output_height: Target height (9:16)
         sample_rate: Process every Nth frame
+        decode_threads: FFmpeg decoder threads (None = OpenCV's default)
         
     Returns:
         List of crop coordinates per frame
     """
     console.print(f"[cyan]Analyzing video for smart cropping ({start_time:.1f}s - {end_time:.1f}s)...[/cyan]")
     
-    cap = cv2.VideoCapture(str(video_path))
+    if decode_threads:
+        cap = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG, [cv2.CAP_PROP_N_THREADS, decode_threads])
+    else:
+        cap = cv2.VideoCapture(str(video_path))
     fps = cap.get(cv2.CAP_PROP_FPS)
     source_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     source_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
     
+    if sample_rate is None:
+        sample_rate = max(1, round(fps * DETECT_INTERVAL))
+    
     # Initialize detector and tracker
     detector = PersonDetector()
     tracker = SpeakerTracker(
         source_width=source_width,
         source_height=source_height,
         target_width=output_width,
-        target_height=output_height
+        target_height=output_height,
+        smoothing_window=max(2, round(SMOOTHING_SECONDS * fps / sample_rate))
     )
     
     # Seek to start
@@ -236,8 +358,11 @@ def generate_crop_trajectory(
     end_frame = int(end_time * fps)
     cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
     
-    crop_data = []
     total_frames = end_frame - start_frame
+    sample_idx = []
+    sample_x = []
+    sample_y = []
+    crop_region = None
     
     with Progress(
         TextColumn("[progress.description]{task.description}"),
@@ -249,43 +374,66 @@ def generate_crop_trajectory(
         task = progress.add_task("Detecting speakers", total=total_frames)
         
         frame_idx = 0
-        last_crop = None
         
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret or frame_idx >= total_frames:
-                break
-            
-            current_frame = start_frame + frame_idx
-            
-            # Only process every Nth frame for speed
+        while cap.isOpened() and frame_idx < total_frames:
+            # Only decode and process every Nth frame for speed
             if frame_idx % sample_rate == 0:
-                detections = detector.detect(frame)
-                crop_region = tracker.update(detections)
-                last_crop = crop_region
-            else:
-                # Use interpolated/last crop for non-processed frames
-                crop_region = last_crop or tracker.update([])
-            
-            crop_data.append({
-                "frame": current_frame,
-                "time": current_frame / fps,
-                "x": crop_region.x,
-                "y": crop_region.y,
-                "width": crop_region.width,
-                "height": crop_region.height
-            })
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                crop_region = tracker.update(detector.detect(frame))
+                sample_idx.append(frame_idx)
+                sample_x.append(crop_region.x)
+                sample_y.append(crop_region.y)
+            elif not cap.grab():
+                break
             
             frame_idx += 1
             progress.update(task, advance=1)
     
     cap.release()
     
+    if crop_region is None:
+        crop_region = tracker.update([])
+        sample_idx, sample_x, sample_y = [0], [crop_region.x], [crop_region.y]
+    
+    # Interpolate crop positions between detection samples
+    frames = np.arange(frame_idx)
+    xs = np.rint(np.interp(frames, sample_idx, sample_x)).astype(int)
+    ys = np.rint(np.interp(frames, sample_idx, sample_y)).astype(int)
+    
+    crop_data = [
+        {
+            "frame": start_frame + i,
+            "time": (start_frame + i) / fps,
+            "x": int(xs[i]),
+            "y": int(ys[i]),
+            "width": crop_region.width,
+            "height": crop_region.height
+        }
+        for i in range(frame_idx)
+    ]
+    
     console.print(f"[green]✓ Generated crop trajectory for {len(crop_data)} frames[/green]")
     
     return crop_data
 
 
+def slice_trajectory(
+    trajectory: List[Dict],
+    start_time: float,
+    end_time: float
+) -> List[Dict]:
+    """
+    Frames of a crop trajectory that fall in [start_time, end_time).
+    Lets overlapping clips share one trajectory computed over their combined span.
+    """
+    times = np.fromiter((c["time"] for c in trajectory), dtype=np.float64, count=len(trajectory))
+    lo = int(np.searchsorted(times, start_time, side="left"))
+    hi = int(np.searchsorted(times, end_time, side="left"))
+    return trajectory[lo:hi]
+
+
 def apply_smart_crop(
     video_path: Path,
     output_path: Path,
@@ -327,19 +475,18 @@ def apply_smart_crop(
     
     cmd = [
         "ffmpeg", "-y",
+        "-loglevel", "error",  # Keep stderr to real errors only
         "-ss", str(start_time),
         "-i", str(video_path),
         "-t", str(duration),
         "-vf", f"crop={crop_w}:{crop_h}:{avg_x}:{avg_y},scale={output_width}:{output_height}",
-        "-c:v", "libx264",
-        "-preset", "fast",
-        "-crf", "18",
-        "-c:a", "aac",
-        "-b:a", "192k",
+        *CROP_ENCODE_ARGS,
         str(output_path)
     ]
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = subprocess.run(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False
+    )
     if result.returncode != 0:
         console.print(f"[red]FFmpeg error: {result.stderr}[/red]")
         raise RuntimeError("Failed to crop video")
@@ -348,6 +495,30 @@ def apply_smart_crop(
     return output_path
 
 
+def process_clip(
+    video_path: Path,
+    start_time: float,
+    end_time: float,
+    output_path: Path,
+    output_width: int = 1080,
+    output_height: int = 1920
+) -> Path:
+    """
+    Analyze and crop a single clip.
+    Top-level so it can be shipped to a worker process.
+    """
+    trajectory = generate_crop_trajectory(
+        video_path, start_time, end_time,
+        output_width=output_width,
+        output_height=output_height
+    )
+    return apply_smart_crop(
+        video_path, output_path,
+        start_time, end_time, trajectory,
+        output_width, output_height
+    )
+
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) > 3:
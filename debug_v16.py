@@ -65,11 +65,11 @@ def debug_render():
     print("Rendering...")
     out = OUTPUT_DIR / "debug_v16_test.mp4"
     res = subprocess.run([
-        "ffmpeg", "-y", "-i", str(base),
+        "ffmpeg", "-y", "-loglevel", "error", "-i", str(base),
         "-vf", filter_str,
         "-c:v", "libx264", "-preset", "ultrafast",
         "-c:a", "copy", str(out)
-    ], capture_output=True)
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=False)
     
     if res.returncode != 0:
         print("FFmpeg Error:")
@@ -3,21 +3,31 @@
 Plain Clip Exporter
 Exports all 11 clips without any captions or titles - just the raw cropped video.
 """
+import os
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import List
 from rich.console import Console
 from rich.panel import Panel
 
+from fast_renderer import hw_encoder_args, hwaccel_args
+
 console = Console()
 
 VIDEO_PATH = Path("/Users/salmaanrauf/Documents/Other/Podcast w Dr Abud.mp4")
 OUTPUT_DIR = Path("/Users/salmaanrauf/Documents/Other/viral_clip_generator/output_clips/plain_clips")
-TEMP_DIR = Path("/Users/salmaanrauf/Documents/Other/viral_clip_generator/temp")
 
 OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
 
 OUT_W, OUT_H = 1080, 1920
 
+# libx264 threads per ffmpeg; workers * threads should roughly match the core count
+FFMPEG_THREADS = 2
+
+# Software fallback when no hardware H.264 encoder (VideoToolbox/NVENC) is found
+X264_ARGS = ["-c:v", "libx264", "-preset", "fast", "-crf", "18"]
+
 CLIPS = [
     {"id": 1, "name": "clip_01_purple_tricep", "start": 3938.0, "end": 3984.0},
     {"id": 2, "name": "clip_02_rat_acl", "start": 2305.0, "end": 2334.0},
@@ -32,8 +42,11 @@ CLIPS = [
     {"id": 11, "name": "clip_11_hgh_stack", "start": 4264.0, "end": 4303.0},
 ]
 
-def extract_plain_clip(clip: dict) -> Path:
-    """Extract and crop video without any overlays"""
+def extract_plain_clip(clip: dict, video_codec_args: List[str], hwaccel: List[str]) -> Path:
+    """
+    Extract and crop video without any overlays.
+    Encoder/hwaccel args come from the parent, so workers don't re-probe ffmpeg.
+    """
     name = clip['name']
     start = clip['start']
     end = clip['end']
@@ -41,33 +54,17 @@ def extract_plain_clip(clip: dict) -> Path:
     
     console.print(f"  Extracting {name} ({duration:.0f}s)...")
     
-    # Extract raw segment
-    raw_path = TEMP_DIR / "temp_plain.mp4"
-    subprocess.run([
-        "ffmpeg", "-y", "-ss", str(start), "-i", str(VIDEO_PATH),
-        "-t", str(duration), "-c:v", "libx264", "-preset", "fast", "-crf", "18",
-        "-c:a", "aac", "-b:a", "192k", str(raw_path)
-    ], capture_output=True, check=True)
-    
-    # Get dimensions for cropping
-    res = subprocess.run([
-        "ffprobe", "-v", "error", "-select_streams", "v:0",
-        "-show_entries", "stream=width,height", "-of", "csv=p=0", str(raw_path)
-    ], capture_output=True, text=True)
-    w, h = map(int, res.stdout.strip().split(','))
-    
-    # Center crop for 9:16
-    crop_w = min(int((h * 9 / 16) * 1.25), w)
-    crop_x = (w - crop_w) // 2
-    
-    # Final output with crop and scale
+    # Seek, crop, scale and pad in a single pass. The crop width is an
+    # expression on the input size, so no probe or intermediate file is needed.
     output_path = OUTPUT_DIR / f"{name}_plain.mp4"
     subprocess.run([
-        "ffmpeg", "-y", "-i", str(raw_path),
-        "-vf", f"crop={crop_w}:{h}:{crop_x}:0,scale={OUT_W}:{OUT_H}:force_original_aspect_ratio=decrease,pad={OUT_W}:{OUT_H}:(ow-iw)/2:(oh-ih)/2:black",
-        "-c:v", "libx264", "-preset", "fast", "-crf", "18",
-        "-c:a", "copy", str(output_path)
-    ], capture_output=True, check=True)
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+        *hwaccel, "-ss", str(start), "-i", str(VIDEO_PATH), "-t", str(duration),
+        "-vf", f"crop='min(ih*9/16*1.25,iw)':ih:(iw-ow)/2:0,scale={OUT_W}:{OUT_H}:force_original_aspect_ratio=decrease,pad={OUT_W}:{OUT_H}:(ow-iw)/2:(oh-ih)/2:black",
+        *video_codec_args,
+        "-threads", str(FFMPEG_THREADS),
+        "-c:a", "aac", "-b:a", "192k", str(output_path)
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
     
     console.print(f"    ✓ {output_path.name}")
     return output_path
@@ -80,8 +77,17 @@ def main():
         title="Export"
     ))
     
-    for clip in CLIPS:
-        extract_plain_clip(clip)
+    # Probe ffmpeg for hardware support once, here, not in every worker
+    video_codec_args = hw_encoder_args() or X264_ARGS
+    hwaccel = hwaccel_args()
+    
+    # Clips are independent - run several ffmpeg jobs side by side
+    workers = max(1, min(len(CLIPS), (os.cpu_count() or 2) // FFMPEG_THREADS))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(
+            extract_plain_clip, CLIPS,
+            [video_codec_args] * len(CLIPS), [hwaccel] * len(CLIPS)
+        ))
     
     console.print(Panel.fit(
         f"[bold green]✅ All {len(CLIPS)} plain clips exported![/bold green]\n"
@@ -1,38 +1,96 @@
 #!/usr/bin/env python3
 """
 Face Detection Module for Viral Clip Generator
-Uses OpenCV's Haar Cascades (reliable, no MediaPipe API issues)
+Uses OpenCV's DNN ResNet-SSD face model when its files are present in
+assets/models, otherwise OpenCV's Haar Cascades (reliable, no MediaPipe API issues)
 """
 import cv2
+import functools
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 import numpy as np
 
+# Haar runtime scales with pixel count; podcast faces are large enough to
+# detect reliably on a downscaled frame
+MAX_DETECT_WIDTH = 640
+
+# OpenCV DNN face detector (ResNet-10 SSD, Caffe) - one 300x300 forward pass per frame
+MODEL_DIR = Path(__file__).parent / "assets" / "models"
+DNN_PROTOTXT = MODEL_DIR / "deploy.prototxt"
+DNN_WEIGHTS = MODEL_DIR / "res10_300x300_ssd_iter_140000.caffemodel"
+DNN_CONFIDENCE = 0.5
+
+# Motion gating: pixels whose gray level changes by more than MOTION_THRESHOLD
+# count as motion; below MIN_MOTION_AREA of the frame the last faces are reused
+MOTION_THRESHOLD = 25
+MIN_MOTION_AREA = 0.05
+FACE_ROI_PADDING = 0.2
+
+# Blank-frame skip: black/white title cards and flat fills have too little
+# contrast (gray std) or are too dark/bright (gray mean) to contain a face
+BLANK_STD_THRESHOLD = 10.0
+BLANK_MIN_MEAN = 15
+BLANK_MAX_MEAN = 240
+
+# detectMultiScale splits work into width/32 stripes, so a portrait frame gets
+# few, unevenly loaded tasks and cores sit idle. Parallelising over frames
+# (analyze_speaker_segments, or one process per clip) scales better, so when
+# ANALYZE_PARALLEL=1 each worker runs OpenCV single-threaded to avoid
+# oversubscription; otherwise OpenCV keeps its default thread pool
+# (note setNumThreads(0) would disable threading, not use every core).
+ANALYZE_PARALLEL = os.environ.get("ANALYZE_PARALLEL") == "1"
+if ANALYZE_PARALLEL:
+    cv2.setNumThreads(1)
+
 class FaceDetector:
-    """Detect and track faces in video frames using OpenCV Haar Cascades."""
+    """Detect and track faces in video frames (OpenCV DNN, Haar fallback)."""
     
-    def __init__(self):
-        # Load pre-trained face detector
-        cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        self.face_cascade = cv2.CascadeClassifier(cascade_path)
+    def __init__(self, use_dnn: bool = True, motion_gating: bool = True):
+        self.net = None
+        self.face_cascade = None
+        
+        # Previous (downscaled) frame and faces for motion gating
+        self.motion_gating = motion_gating
+        self.prev_gray = None
+        self.prev_faces = None
+        
+        if use_dnn and DNN_PROTOTXT.exists() and DNN_WEIGHTS.exists():
+            self.net = cv2.dnn.readNetFromCaffe(str(DNN_PROTOTXT), str(DNN_WEIGHTS))
+            if cv2.cuda.getCudaEnabledDeviceCount() > 0:
+                self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
+                self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
+            else:
+                self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+                self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        else:
+            # Load pre-trained face detector
+            cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+            self.face_cascade = cv2.CascadeClassifier(cascade_path)
+    
+    def reset(self):
+        """Forget the previous frame, e.g. before scanning an unrelated time range"""
+        self.prev_gray = None
+        self.prev_faces = None
     
     def detect_faces(self, frame: np.ndarray) -> List[Dict]:
         """
         Detect all faces in a frame.
         Returns list of face dictionaries with bounding box info.
         """
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self._is_blank(frame):
+            return []
         
-        # Detect faces
-        faces_rects = self.face_cascade.detectMultiScale(
-            gray,
-            scaleFactor=1.1,
-            minNeighbors=5,
-            minSize=(50, 50)
-        )
+        if self.net is not None:
+            faces_rects = self._detect_dnn(frame)
+        else:
+            faces_rects = self._detect_haar(frame)
         
         faces = []
-        h, w = frame.shape[:2]
+        w = frame.shape[1]
         
         for (x, y, width, height) in faces_rects:
             center_x = x + width // 2
@@ -50,6 +108,105 @@ class FaceDetector:
         
         return faces
     
+    @staticmethod
+    def _is_blank(frame: np.ndarray) -> bool:
+        """Cheap check for uniform or near-black/white frames (no face possible)"""
+        # Every 8th pixel is plenty for global statistics
+        gray = cv2.cvtColor(np.ascontiguousarray(frame[::8, ::8]), cv2.COLOR_BGR2GRAY)
+        mean, std = cv2.meanStdDev(gray)
+        mean, std = float(mean[0, 0]), float(std[0, 0])
+        return std < BLANK_STD_THRESHOLD or mean < BLANK_MIN_MEAN or mean > BLANK_MAX_MEAN
+    
+    def _detect_dnn(self, frame: np.ndarray) -> List[tuple]:
+        """Run the SSD face model on a BGR frame, returns (x, y, w, h) boxes"""
+        h, w = frame.shape[:2]
+        
+        blob = cv2.dnn.blobFromImage(frame, 1.0, (300, 300), (104.0, 177.0, 123.0))
+        self.net.setInput(blob)
+        dets = self.net.forward()
+        
+        rects = []
+        for i in range(dets.shape[2]):
+            if dets[0, 0, i, 2] < DNN_CONFIDENCE:
+                continue
+            x1, y1, x2, y2 = dets[0, 0, i, 3:7] * np.array([w, h, w, h])
+            x1, y1 = max(0, int(x1)), max(0, int(y1))
+            x2, y2 = min(w, int(x2)), min(h, int(y2))
+            if x2 > x1 and y2 > y1:
+                rects.append((x1, y1, x2 - x1, y2 - y1))
+        
+        return rects
+    
+    def _detect_haar(self, frame: np.ndarray) -> List[tuple]:
+        """Run the Haar cascade on a downscaled gray frame, returns (x, y, w, h) boxes"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        w = frame.shape[1]
+        
+        # Downscale before detection, then map boxes back to full resolution
+        scale = MAX_DETECT_WIDTH / w if w > MAX_DETECT_WIDTH else 1.0
+        if scale < 1.0:
+            gray_small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        else:
+            gray_small = gray
+        min_face = int(50 * scale)
+        
+        # Detect faces
+        faces_rects = self._detect_gated(gray_small, min_face)
+        
+        inv_scale = 1.0 / scale
+        return [tuple(int(v * inv_scale) for v in rect) for rect in faces_rects]
+    
+    def _run_cascade(self, gray: np.ndarray, min_face: int) -> List[tuple]:
+        rects = self.face_cascade.detectMultiScale(
+            gray,
+            scaleFactor=1.2,
+            minNeighbors=5,
+            minSize=(min_face, min_face)
+        )
+        return [tuple(int(v) for v in rect) for rect in rects]
+    
+    def _detect_gated(self, gray_small: np.ndarray, min_face: int) -> List[tuple]:
+        """
+        Run the cascade only where something changed since the previous frame.
+        
+        Static podcast shots barely move between samples: if almost nothing
+        moved, the previous faces are reused; otherwise only the moving regions
+        plus the (padded) previous face boxes are scanned.
+        """
+        prev_gray, prev_faces = self.prev_gray, self.prev_faces
+        self.prev_gray = gray_small
+        
+        if (not self.motion_gating or not prev_faces
+                or prev_gray is None or prev_gray.shape != gray_small.shape):
+            self.prev_faces = self._run_cascade(gray_small, min_face)
+            return self.prev_faces
+        
+        diff = cv2.absdiff(gray_small, prev_gray)
+        _, motion = cv2.threshold(diff, MOTION_THRESHOLD, 255, cv2.THRESH_BINARY)
+        motion = cv2.dilate(motion, None, iterations=3)
+        
+        h, w = gray_small.shape
+        if cv2.countNonZero(motion) < MIN_MOTION_AREA * w * h:
+            return prev_faces
+        
+        # ROI = motion regions + previous faces; contours merge overlapping areas
+        for (x, y, fw, fh) in prev_faces:
+            pad_x, pad_y = int(fw * FACE_ROI_PADDING), int(fh * FACE_ROI_PADDING)
+            motion[max(0, y - pad_y):y + fh + pad_y, max(0, x - pad_x):x + fw + pad_x] = 255
+        contours, _ = cv2.findContours(motion, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        faces = []
+        for contour in contours:
+            rx, ry, rw, rh = cv2.boundingRect(contour)
+            if rw < min_face or rh < min_face:
+                continue
+            roi = gray_small[ry:ry + rh, rx:rx + rw]
+            for (x, y, fw, fh) in self._run_cascade(roi, min_face):
+                faces.append((x + rx, y + ry, fw, fh))
+        
+        self.prev_faces = faces
+        return faces
+    
     def identify_speaker(self, frame: np.ndarray) -> Optional[str]:
         """
         Determine which speaker is in the frame.
@@ -90,32 +247,88 @@ class FaceDetector:
         
         return (x1, y1, x2, y2)
 
-def analyze_speaker_segments(video_path: Path, sample_interval: float = 0.5) -> List[Dict]:
+_thread_state = threading.local()
+
+@functools.lru_cache(maxsize=1)
+def _get_detector() -> FaceDetector:
+    """Shared detector, so the model/cascade is only loaded once per process"""
+    return FaceDetector()
+
+def _get_thread_detector() -> FaceDetector:
+    """Per-thread detector - cascades aren't documented as safe to share across threads"""
+    detector = getattr(_thread_state, "detector", None)
+    if detector is None:
+        detector = _thread_state.detector = FaceDetector()
+    return detector
+
+def _sample_speakers(video_path: Path, start_frame: int, end_frame: int,
+                     frame_interval: int, fps: float) -> List[Dict]:
     """
-    Analyze video to find when speakers change.
-    Returns list of {start_time, end_time, speaker} segments.
+    Identify the speaker on every `frame_interval`-th frame in [start_frame, end_frame).
+    Opens its own capture and uses a per-thread detector so it can run on a worker thread.
     """
+    # Align to the global sampling grid so chunk boundaries don't shift samples
+    first_frame = start_frame + (-start_frame % frame_interval)
+    
     cap = cv2.VideoCapture(str(video_path))
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    frame_interval = int(fps * sample_interval)
+    if first_frame:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, first_frame)
     
-    detector = FaceDetector()
+    detector = _get_thread_detector()
+    detector.reset()
     samples = []
     
-    frame_num = 0
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
+    frame_num = first_frame
+    while cap.isOpened() and frame_num < end_frame:
         if frame_num % frame_interval == 0:
+            ret, frame = cap.read()
+            if not ret:
+                break
             speaker = detector.identify_speaker(frame)
             time_sec = frame_num / fps
             samples.append({'time': time_sec, 'speaker': speaker})
+        elif not cap.grab():
+            # Skipped frames are only demuxed/decoded, never converted to BGR
+            break
         
         frame_num += 1
     
     cap.release()
+    return samples
+
+def analyze_speaker_segments(video_path: Path, sample_interval: float = 0.5,
+                             workers: Optional[int] = None) -> List[Dict]:
+    """
+    Analyze video to find when speakers change.
+    Returns list of {start_time, end_time, speaker} segments.
+    
+    The timeline is split into one frame range per worker thread; OpenCV
+    releases the GIL while decoding and detecting, so ranges run in parallel.
+    """
+    cap = cv2.VideoCapture(str(video_path))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    
+    frame_interval = max(1, int(fps * sample_interval))
+    
+    if total_frames <= 0:
+        # Unknown length (some containers) - scan sequentially to the end
+        ranges = [(0, sys.maxsize)]
+    else:
+        workers = workers or os.cpu_count() or 1
+        chunk = -(-total_frames // workers)
+        chunk += -chunk % frame_interval  # Whole sampling steps per range
+        ranges = [(s, min(s + chunk, total_frames)) for s in range(0, total_frames, chunk)]
+    
+    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+        results = executor.map(
+            lambda r: _sample_speakers(video_path, r[0], r[1], frame_interval, fps),
+            ranges
+        )
+        samples = [sample for chunk_samples in results for sample in chunk_samples]
+    
+    samples.sort(key=lambda sample: sample['time'])
     
     # Convert samples to segments
     if not samples:
@@ -145,40 +358,51 @@ def analyze_speaker_segments(video_path: Path, sample_interval: float = 0.5) ->
     return segments
 
 def extract_reference_face(video_path: Path, target_speaker: str, 
-                          start_time: float, end_time: float) -> Optional[str]:
+                          start_time: float, end_time: float) -> Optional[np.ndarray]:
     """
     Extract a reference frame for a specific speaker.
-    Saves to temp and returns the path.
+    Returns the BGR frame, or None if the speaker never shows up.
     """
-    import subprocess
-    from pathlib import Path
-    
-    temp_dir = Path(video_path).parent / "temp"
-    temp_dir.mkdir(exist_ok=True)
-    
     # Sample frames to find one with the target speaker
     cap = cv2.VideoCapture(str(video_path))
     fps = cap.get(cv2.CAP_PROP_FPS)
     cap.set(cv2.CAP_PROP_POS_FRAMES, int(start_time * fps))
     
-    detector = FaceDetector()
+    detector = _get_detector()
+    detector.reset()
     
-    for _ in range(int((end_time - start_time) * fps / 30)):  # Sample every 30 frames
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        speaker = detector.identify_speaker(frame)
-        if speaker == target_speaker:
-            # Found a frame with target speaker
-            output_path = temp_dir / f"ref_face_{target_speaker}.jpg"
-            cv2.imwrite(str(output_path), frame)
-            cap.release()
-            return str(output_path)
+    try:
+        for _ in range(int((end_time - start_time) * fps / 30)):  # Sample every 30 frames
+            ret, frame = cap.read()
+            if not ret:
+                break
+            
+            # read() hands back a fresh buffer, so the frame can be returned as-is
+            if detector.identify_speaker(frame) == target_speaker:
+                return frame
+    finally:
+        cap.release()
     
-    cap.release()
     return None
 
+
+def extract_reference_face_to_path(video_path: Path, target_speaker: str,
+                                   start_time: float, end_time: float) -> Optional[str]:
+    """
+    Same as extract_reference_face, but saves the frame to temp and returns
+    the path (for consumers that need a file, e.g. an ffmpeg input).
+    """
+    frame = extract_reference_face(video_path, target_speaker, start_time, end_time)
+    if frame is None:
+        return None
+    
+    temp_dir = Path(video_path).parent / "temp"
+    temp_dir.mkdir(exist_ok=True)
+    
+    output_path = temp_dir / f"ref_face_{target_speaker}.jpg"
+    cv2.imwrite(str(output_path), frame)
+    return str(output_path)
+
 if __name__ == "__main__":
     import sys
     
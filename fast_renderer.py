@@ -2,17 +2,39 @@
 Fast Renderer - Direct FFmpeg rendering for maximum speed
 Replaces MoviePy with native FFmpeg for 10x faster output.
 """
+import functools
+import hashlib
+import json
+import os
+import shutil
 import subprocess
+import sys
 from pathlib import Path
 from typing import Optional, List, Tuple
 from dataclasses import dataclass
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+from config import TEMP_DIR
+
+try:
+    import av
+    # Wheels from PyPI ship FFmpeg without libass; only a build against a
+    # libass-enabled FFmpeg can burn subtitles in-process
+    HAS_PYAV_LIBASS = "subtitles" in av.filter.filters_available
+except ImportError:
+    HAS_PYAV_LIBASS = False
+
 console = Console()
 
+# ffprobe results keyed by path/mtime/size, so repeat probes skip the process spawn
+FFPROBE_CACHE_PATH = TEMP_DIR / "ffprobe_cache.json"
 
-@dataclass
+# Max distance (seconds) between a requested cut and a keyframe for stream copy
+KEYFRAME_SNAP_TOLERANCE = 0.1
+
+
+@dataclass(frozen=True, slots=True)
 class RenderConfig:
     """Rendering configuration"""
     output_width: int = 1080
@@ -23,6 +45,126 @@ class RenderConfig:
     preset: str = "fast"  # ultrafast, fast, medium, slow
     crf: int = 23         # Quality (lower = better, 18-28 typical)
     audio_bitrate: str = "192k"
+    use_hwenc: bool = True   # Use a hardware encoder (VideoToolbox/NVENC) when available
+    hw_bitrate: str = "8M"   # VideoToolbox is bitrate-controlled, not CRF
+    threads: int = 0         # Encoder threads per ffmpeg (0 = auto); cap when running clips in parallel
+
+
+# Shared default; RenderConfig is frozen so one instance is safe to reuse
+DEFAULT_CONFIG = RenderConfig()
+
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_encoders() -> str:
+    """`ffmpeg -encoders` listing (empty if ffmpeg is missing)"""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True, text=True
+        )
+    except FileNotFoundError:
+        return ""
+    return result.stdout
+
+
+def has_videotoolbox() -> bool:
+    """Check whether this ffmpeg build ships the h264_videotoolbox encoder"""
+    return sys.platform == "darwin" and "h264_videotoolbox" in _ffmpeg_encoders()
+
+
+def has_nvenc() -> bool:
+    """Check for the h264_nvenc encoder and an NVIDIA driver to run it"""
+    return "h264_nvenc" in _ffmpeg_encoders() and shutil.which("nvidia-smi") is not None
+
+
+def hw_encoder_args(bitrate: str = "8M", cq: int = 19) -> Optional[List[str]]:
+    """
+    Hardware H.264 encoder args for this machine, or None to stay on libx264.
+    VideoToolbox (Apple media engine) on macOS, NVENC on NVIDIA.
+    """
+    if has_videotoolbox():
+        return ["-c:v", "h264_videotoolbox", "-b:v", bitrate, "-allow_sw", "1", "-realtime", "0"]
+    if has_nvenc():
+        return ["-c:v", "h264_nvenc", "-preset", "p4", "-rc", "vbr", "-cq", str(cq), "-b:v", "0"]
+    return None
+
+
+def hwaccel_args() -> List[str]:
+    """Input args (before -i) to decode on the same device as hw_encoder_args"""
+    if has_videotoolbox():
+        return ["-hwaccel", "videotoolbox"]
+    if has_nvenc():
+        return ["-hwaccel", "cuda"]
+    return []
+
+
+def video_codec_args(config: RenderConfig) -> List[str]:
+    """
+    Video encoder args for a config.
+    Swaps libx264 for a hardware encoder (see hw_encoder_args) when enabled and
+    available, otherwise uses the configured software codec/preset/CRF.
+    """
+    threads = ["-threads", str(config.threads)] if config.threads else []
+    if config.use_hwenc and config.video_codec == "libx264":
+        hw_args = hw_encoder_args(config.hw_bitrate, config.crf)
+        if hw_args:
+            return [*hw_args, *threads]
+    return [
+        "-c:v", config.video_codec,
+        "-preset", config.preset,
+        "-crf", str(config.crf),
+        *threads,
+    ]
+
+
+def _trim_args(
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None
+) -> Tuple[List[str], List[str]]:
+    """
+    FFmpeg args to process only [start_time, end_time] of an input.
+    Returns (before_input, after_input). -ss goes before -i so the demuxer
+    seeks straight to the position instead of decoding from frame 0; that seek
+    is keyframe-accurate. For a sample-accurate trim, put -ss after -i instead.
+    """
+    before = ["-ss", str(start_time)] if start_time is not None else []
+    after = ["-t", str(end_time - (start_time or 0.0))] if end_time is not None else []
+    return before, after
+
+
+def find_nearest_keyframe(
+    video_path: Path,
+    time: float,
+    search_window: float = 5.0
+) -> Optional[float]:
+    """
+    Find the video keyframe closest to `time`.
+    Only decodes keyframes inside +/- search_window seconds, so this is cheap.
+    """
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-skip_frame", "nokey",
+        "-read_intervals", f"{max(0.0, time - search_window)}%{time + search_window}",
+        "-show_entries", "frame=pts_time",
+        "-of", "csv=p=0",
+        str(video_path)
+    ]
+    
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    
+    keyframes = []
+    for line in result.stdout.splitlines():
+        try:
+            keyframes.append(float(line.strip().rstrip(",")))
+        except ValueError:
+            continue
+    
+    if not keyframes:
+        return None
+    return min(keyframes, key=lambda k: abs(k - time))
 
 
 def extract_clip(
@@ -30,29 +172,50 @@ def extract_clip(
     output_path: Path,
     start_time: float,
     end_time: float,
-    config: RenderConfig = None
+    config: RenderConfig = None,
+    allow_stream_copy: bool = False
 ) -> Path:
     """
     Extract a clip from video with precise timestamps.
     Uses FFmpeg's seeking for fast extraction.
+    
+    With allow_stream_copy, if the start lands within KEYFRAME_SNAP_TOLERANCE
+    of a keyframe, the segment is stream-copied instead of re-encoded (source
+    codec/bitrate, starting on the keyframe; costs one ffprobe). Off by default
+    so callers get the configured encode unless they opt in.
     """
-    config = config or RenderConfig()
+    config = config or DEFAULT_CONFIG
     duration = end_time - start_time
     
+    if allow_stream_copy:
+        keyframe = find_nearest_keyframe(video_path, start_time)
+        if keyframe is not None and abs(start_time - keyframe) < KEYFRAME_SNAP_TOLERANCE:
+            cmd = [
+                "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+                "-ss", str(keyframe),
+                "-i", str(video_path),
+                "-t", str(duration),
+                "-c", "copy",
+                str(output_path)
+            ]
+            
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            if result.returncode == 0:
+                return output_path
+            # Fall through to a full re-encode if the copy fails
+    
     cmd = [
-        "ffmpeg", "-y",
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
         "-ss", str(start_time),
         "-i", str(video_path),
         "-t", str(duration),
-        "-c:v", config.video_codec,
-        "-preset", config.preset,
-        "-crf", str(config.crf),
+        *video_codec_args(config),
         "-c:a", config.audio_codec,
         "-b:a", config.audio_bitrate,
         str(output_path)
     ]
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
     if result.returncode != 0:
         raise RuntimeError(f"FFmpeg extract failed: {result.stderr}")
     
@@ -66,27 +229,31 @@ def apply_crop(
     crop_y: int,
     crop_width: int,
     crop_height: int,
-    config: RenderConfig = None
+    config: RenderConfig = None,
+    start_time: float = None,
+    end_time: float = None
 ) -> Path:
     """
     Apply crop to video.
+    Optionally only the [start_time, end_time] range is processed (see _trim_args).
     """
-    config = config or RenderConfig()
+    config = config or DEFAULT_CONFIG
     
     crop_filter = f"crop={crop_width}:{crop_height}:{crop_x}:{crop_y}"
+    seek, limit = _trim_args(start_time, end_time)
     
     cmd = [
-        "ffmpeg", "-y",
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+        *seek,
         "-i", str(video_path),
+        *limit,
         "-vf", crop_filter,
-        "-c:v", config.video_codec,
-        "-preset", config.preset,
-        "-crf", str(config.crf),
+        *video_codec_args(config),
         "-c:a", "copy",
         str(output_path)
     ]
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
     if result.returncode != 0:
         raise RuntimeError(f"FFmpeg crop failed: {result.stderr}")
     
@@ -97,34 +264,108 @@ def burn_subtitles(
     video_path: Path,
     subtitle_path: Path,
     output_path: Path,
-    config: RenderConfig = None
+    config: RenderConfig = None,
+    start_time: float = None,
+    end_time: float = None
 ) -> Path:
     """
     Burn ASS/SRT subtitles into video.
+    Optionally only the [start_time, end_time] range is processed (see _trim_args);
+    subtitle times are then relative to start_time.
     """
-    config = config or RenderConfig()
+    config = config or DEFAULT_CONFIG
     
     # Escape path for FFmpeg filter (handle colons and backslashes)
     sub_escaped = str(subtitle_path).replace("\\", "/").replace(":", r"\:")
     
+    if HAS_PYAV_LIBASS and start_time is None and end_time is None:
+        try:
+            return _burn_subtitles_pyav(video_path, sub_escaped, output_path, config)
+        except (av.error.FFmpegError, ValueError) as e:
+            console.print(f"[yellow]In-process subtitle burn failed ({e}), using ffmpeg[/yellow]")
+    
+    seek, limit = _trim_args(start_time, end_time)
+    
     cmd = [
-        "ffmpeg", "-y",
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+        *seek,
         "-i", str(video_path),
+        *limit,
         "-vf", f"subtitles='{sub_escaped}'",
-        "-c:v", config.video_codec,
-        "-preset", config.preset,
-        "-crf", str(config.crf),
+        *video_codec_args(config),
         "-c:a", "copy",
         str(output_path)
     ]
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
     if result.returncode != 0:
         raise RuntimeError(f"FFmpeg subtitle burn failed: {result.stderr}")
     
     return output_path
 
 
+def _pyav_encoder(config: RenderConfig) -> Tuple[str, dict]:
+    """Codec name and AVOptions for PyAV, mirroring video_codec_args"""
+    if config.use_hwenc and config.video_codec == "libx264":
+        if has_videotoolbox():
+            return "h264_videotoolbox", {"b": config.hw_bitrate, "allow_sw": "1", "realtime": "0"}
+        if has_nvenc():
+            return "h264_nvenc", {"preset": "p4", "rc": "vbr", "cq": str(config.crf), "b": "0"}
+    return config.video_codec, {"preset": config.preset, "crf": str(config.crf)}
+
+
+def _burn_subtitles_pyav(
+    video_path: Path,
+    sub_escaped: str,
+    output_path: Path,
+    config: RenderConfig
+) -> Path:
+    """
+    burn_subtitles without spawning ffmpeg: decode, run the libass `subtitles`
+    filter and encode inside this process via PyAV. Audio packets are remuxed.
+    """
+    codec, options = _pyav_encoder(config)
+    
+    with av.open(str(video_path)) as src, av.open(str(output_path), "w") as dst:
+        in_video = src.streams.video[0]
+        in_audio = src.streams.audio[0] if src.streams.audio else None
+        
+        out_video = dst.add_stream(codec, rate=in_video.average_rate, options=options)
+        out_video.width = in_video.codec_context.width
+        out_video.height = in_video.codec_context.height
+        out_video.pix_fmt = "yuv420p"
+        if config.threads:
+            out_video.codec_context.thread_count = config.threads
+        out_audio = dst.add_stream_from_template(in_audio) if in_audio else None
+        
+        graph = av.filter.Graph()
+        graph.link_nodes(
+            graph.add_buffer(template=in_video),
+            graph.add("subtitles", f"filename='{sub_escaped}'"),
+            graph.add("format", "yuv420p"),
+            graph.add("buffersink"),
+        ).configure()
+        
+        def encode(frame):
+            for packet in out_video.encode(frame):
+                dst.mux(packet)
+        
+        streams = [in_video, in_audio] if in_audio else [in_video]
+        for packet in src.demux(*streams):
+            if packet.stream is in_audio:
+                if packet.dts is not None:  # Skip the demuxer's flush packet
+                    packet.stream = out_audio
+                    dst.mux(packet)
+                continue
+            for frame in packet.decode():  # Flush packet drains the decoder
+                graph.push(frame)
+                encode(graph.pull())
+        
+        encode(None)  # Flush encoder
+    
+    return output_path
+
+
 def overlay_video(
     base_video: Path,
     overlay_video: Path,
@@ -133,12 +374,17 @@ def overlay_video(
     duration: float,
     position: str = "center",  # center, top, bottom
     opacity: float = 1.0,
-    config: RenderConfig = None
+    config: RenderConfig = None,
+    trim_start: float = None,
+    trim_end: float = None
 ) -> Path:
     """
     Overlay one video on another (for B-roll insertion).
+    Optionally only [trim_start, trim_end] of the base video is processed
+    (see _trim_args); start_time is then relative to trim_start.
     """
-    config = config or RenderConfig()
+    config = config or DEFAULT_CONFIG
+    seek, limit = _trim_args(trim_start, trim_end)
     
     # Calculate position
     if position == "top":
@@ -155,18 +401,18 @@ def overlay_video(
     )
     
     cmd = [
-        "ffmpeg", "-y",
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+        *seek,
         "-i", str(base_video),
         "-i", str(overlay_video),
+        *limit,
         "-filter_complex", filter_complex,
-        "-c:v", config.video_codec,
-        "-preset", config.preset,
-        "-crf", str(config.crf),
+        *video_codec_args(config),
         "-c:a", "copy",
         str(output_path)
     ]
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
     if result.returncode != 0:
         raise RuntimeError(f"FFmpeg overlay failed: {result.stderr}")
     
@@ -178,12 +424,17 @@ def merge_audio_tracks(
     audio_path: Path,
     output_path: Path,
     audio_volume: float = 0.3,  # Background music volume
-    config: RenderConfig = None
+    config: RenderConfig = None,
+    start_time: float = None,
+    end_time: float = None
 ) -> Path:
     """
     Merge additional audio track (background music) with video.
+    Optionally only the [start_time, end_time] range of the video is
+    processed (see _trim_args); the music always starts at 0.
     """
-    config = config or RenderConfig()
+    config = config or DEFAULT_CONFIG
+    seek, limit = _trim_args(start_time, end_time)
     
     filter_complex = (
         f"[1:a]volume={audio_volume}[bg];"
@@ -191,9 +442,11 @@ def merge_audio_tracks(
     )
     
     cmd = [
-        "ffmpeg", "-y",
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+        *seek,
         "-i", str(video_path),
         "-i", str(audio_path),
+        *limit,
         "-filter_complex", filter_complex,
         "-map", "0:v",
         "-map", "[out]",
@@ -203,13 +456,78 @@ def merge_audio_tracks(
         str(output_path)
     ]
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
     if result.returncode != 0:
         raise RuntimeError(f"FFmpeg audio merge failed: {result.stderr}")
     
     return output_path
 
 
+@functools.lru_cache(maxsize=64)
+def _frame_filters(
+    output_width: int,
+    output_height: int,
+    crop_box: Optional[Tuple[int, int, int, int]] = None
+) -> str:
+    """Crop + scale part of the video filter chain (shared by every clip with the same geometry)"""
+    filters = []
+    if crop_box:
+        x, y, w, h = crop_box
+        filters.append(f"crop={w}:{h}:{x}:{y}")
+    filters.append(f"scale={output_width}:{output_height}")
+    return ",".join(filters)
+
+
+def _parse_ass_time(value: str) -> float:
+    h, m, s = value.strip().split(":")
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+
+def _format_ass_time(seconds: float) -> str:
+    centiseconds = int(round(seconds * 100))
+    h, rem = divmod(centiseconds, 360000)
+    m, rem = divmod(rem, 6000)
+    s, cs = divmod(rem, 100)
+    return f"{h}:{m:02d}:{s:02d}.{cs:02d}"
+
+
+def slice_subtitles(
+    subtitle_path: Path,
+    start_time: float,
+    end_time: float,
+    output_path: Optional[Path] = None
+) -> Path:
+    """
+    Write the events of an ASS file that overlap [start_time, end_time] to a
+    new file, shifted so the clip starts at 0.
+    
+    Lets many clips share one source-timed ASS file while libass only parses
+    each clip's own events, instead of the whole transcript per render.
+    """
+    if output_path is None:
+        output_path = TEMP_DIR / f"{subtitle_path.stem}_{start_time:.2f}_{end_time:.2f}.ass"
+    
+    lines = []
+    for line in subtitle_path.read_text(encoding="utf-8").splitlines():
+        if not line.startswith("Dialogue:"):
+            lines.append(line)
+            continue
+        
+        prefix, rest = line.split(":", 1)
+        fields = rest.split(",", 3)  # Layer, Start, End, remainder
+        event_start = _parse_ass_time(fields[1])
+        event_end = _parse_ass_time(fields[2])
+        if event_end <= start_time or event_start >= end_time:
+            continue
+        
+        fields[1] = _format_ass_time(max(0.0, event_start - start_time))
+        fields[2] = _format_ass_time(min(end_time, event_end) - start_time)
+        lines.append(f"{prefix}:{','.join(fields)}")
+    
+    output_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return output_path
+
+
 def render_full_clip(
     source_video: Path,
     output_path: Path,
@@ -217,7 +535,8 @@ def render_full_clip(
     end_time: float,
     crop_box: Optional[Tuple[int, int, int, int]] = None,  # (x, y, w, h)
     subtitle_path: Optional[Path] = None,
-    config: RenderConfig = None
+    config: RenderConfig = None,
+    subtitles_in_source_time: bool = False
 ) -> Path:
     """
     Full clip render pipeline in a single FFmpeg call.
@@ -231,26 +550,23 @@ def render_full_clip(
         crop_box: Optional crop coordinates (x, y, width, height)
         subtitle_path: Optional ASS subtitle file
         config: Render configuration
+        subtitles_in_source_time: subtitle_path is timed against the whole
+            source (e.g. shared by several clips); only this clip's events
+            are extracted, see slice_subtitles
         
     Returns:
         Path to rendered clip
     """
-    config = config or RenderConfig()
+    config = config or DEFAULT_CONFIG
     duration = end_time - start_time
     
-    # Build filter chain
-    filters = []
-    
-    # Crop filter
-    if crop_box:
-        x, y, w, h = crop_box
-        filters.append(f"crop={w}:{h}:{x}:{y}")
-    
-    # Scale to output size
-    filters.append(f"scale={config.output_width}:{config.output_height}")
+    # Build filter chain (crop + scale cached per geometry)
+    filters = [_frame_filters(config.output_width, config.output_height, crop_box)]
     
     # Subtitle burn (must be last in video filter chain)
     if subtitle_path and subtitle_path.exists():
+        if subtitles_in_source_time:
+            subtitle_path = slice_subtitles(subtitle_path, start_time, end_time)
         sub_escaped = str(subtitle_path).replace("\\", "/").replace(":", r"\:")
         filters.append(f"subtitles='{sub_escaped}'")
     
@@ -259,7 +575,7 @@ def render_full_clip(
     
     # Build command
     cmd = [
-        "ffmpeg", "-y",
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
         "-ss", str(start_time),
         "-i", str(source_video),
         "-t", str(duration),
@@ -269,9 +585,7 @@ def render_full_clip(
         cmd.extend(["-vf", video_filter])
     
     cmd.extend([
-        "-c:v", config.video_codec,
-        "-preset", config.preset,
-        "-crf", str(config.crf),
+        *video_codec_args(config),
         "-c:a", config.audio_codec,
         "-b:a", config.audio_bitrate,
         str(output_path)
@@ -279,7 +593,7 @@ def render_full_clip(
     
     console.print(f"[cyan]Rendering clip ({duration:.1f}s)...[/cyan]")
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
     if result.returncode != 0:
         console.print(f"[red]Render failed: {result.stderr}[/red]")
         raise RuntimeError(f"FFmpeg render failed: {result.stderr}")
@@ -288,8 +602,205 @@ def render_full_clip(
     return output_path
 
 
+@dataclass
+class ClipSpec:
+    """One output clip of a batch render"""
+    output_path: Path
+    start_time: float
+    end_time: float
+    crop_box: Optional[Tuple[int, int, int, int]] = None  # (x, y, w, h)
+    subtitle_path: Optional[Path] = None
+
+
+def render_batch(
+    source_video: Path,
+    clips: List[ClipSpec],
+    config: RenderConfig = None
+) -> List[Path]:
+    """
+    Render several clips of the same source in a single FFmpeg call.
+    
+    The source is decoded once and split into one trim/crop/scale/subtitle
+    chain per clip (one encode per output), instead of opening, seeking and
+    decoding it again for every render_full_clip call.
+    
+    Args:
+        source_video: Input video path
+        clips: Clips to render
+        config: Render configuration (shared by all outputs)
+        
+    Returns:
+        Paths to rendered clips, in the same order as `clips`
+    """
+    config = config or DEFAULT_CONFIG
+    if not clips:
+        return []
+    
+    # Only decode the span covering all clips; trims are relative to its start
+    span_start = min(c.start_time for c in clips)
+    span_end = max(c.end_time for c in clips)
+    n = len(clips)
+    
+    graph = [
+        "[0:v]split=" + str(n) + "".join(f"[vin{i}]" for i in range(n)),
+        "[0:a]asplit=" + str(n) + "".join(f"[ain{i}]" for i in range(n)),
+    ]
+    
+    for i, clip in enumerate(clips):
+        start = clip.start_time - span_start
+        end = clip.end_time - span_start
+        
+        filters = [
+            f"trim=start={start}:end={end}",
+            "setpts=PTS-STARTPTS",
+            _frame_filters(config.output_width, config.output_height, clip.crop_box),
+        ]
+        if clip.subtitle_path and clip.subtitle_path.exists():
+            sub_escaped = str(clip.subtitle_path).replace("\\", "/").replace(":", r"\:")
+            filters.append(f"subtitles='{sub_escaped}'")
+        
+        graph.append(f"[vin{i}]" + ",".join(filters) + f"[v{i}]")
+        graph.append(f"[ain{i}]atrim=start={start}:end={end},asetpts=PTS-STARTPTS[a{i}]")
+    
+    cmd = [
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+        # Input options: read only the span the clips cover
+        "-ss", str(span_start),
+        "-t", str(span_end - span_start),
+        "-i", str(source_video),
+        "-filter_complex", ";".join(graph),
+    ]
+    
+    for i, clip in enumerate(clips):
+        cmd.extend([
+            "-map", f"[v{i}]",
+            "-map", f"[a{i}]",
+            *video_codec_args(config),
+            "-c:a", config.audio_codec,
+            "-b:a", config.audio_bitrate,
+            str(clip.output_path)
+        ])
+    
+    console.print(f"[cyan]Rendering {n} clips in one pass...[/cyan]")
+    
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        console.print(f"[red]Batch render failed: {result.stderr}[/red]")
+        raise RuntimeError(f"FFmpeg batch render failed: {result.stderr}")
+    
+    console.print(f"[green]✓ Rendered {n} clips[/green]")
+    return [clip.output_path for clip in clips]
+
+
+class FFmpegSession:
+    """
+    One FFmpeg process fed a concat list over stdin.
+
+    Joins many segments (files or in/out ranges of files) into a single
+    output with one process spawn instead of one per segment. The win is
+    the fork count, not encode speed. For per-clip filter graphs use
+    render_batch instead.
+
+    Usage:
+        with FFmpegSession(output_path) as session:
+            session.add(clip_a)
+            session.add(source, inpoint=12.0, outpoint=30.5)
+    """
+
+    def __init__(self, output_path: Path, config: RenderConfig = None, stream_copy: bool = False):
+        self.output_path = output_path
+        config = config or DEFAULT_CONFIG
+
+        if stream_copy:
+            codec_args = ["-c", "copy"]
+        else:
+            codec_args = [
+                *video_codec_args(config),
+                "-c:a", config.audio_codec,
+                "-b:a", config.audio_bitrate,
+            ]
+
+        cmd = [
+            "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "concat", "-safe", "0",
+            "-protocol_whitelist", "file,pipe",
+            "-i", "pipe:0",
+            *codec_args,
+            str(output_path)
+        ]
+
+        self.process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        self.process.stdin.write("ffconcat version 1.0\n")
+        self.count = 0
+
+    def add(self, video_path: Path, inpoint: Optional[float] = None, outpoint: Optional[float] = None):
+        """Queue a file (or a range of it) as the next segment"""
+        escaped = str(Path(video_path).resolve()).replace("'", r"'\''")
+        entry = f"file '{escaped}'\n"
+        if inpoint is not None:
+            entry += f"inpoint {inpoint}\n"
+        if outpoint is not None:
+            entry += f"outpoint {outpoint}\n"
+        self.process.stdin.write(entry)
+        self.count += 1
+
+    def close(self) -> Path:
+        """Finish the list and wait for FFmpeg to write the output"""
+        # The concat demuxer reads the whole list before decoding, so
+        # closing stdin is what starts the render
+        _, stderr = self.process.communicate()
+        if self.process.returncode != 0:
+            raise RuntimeError(f"FFmpeg concat failed: {stderr}")
+
+        console.print(f"[green]✓ Joined {self.count} segments: {self.output_path.name}[/green]")
+        return self.output_path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.process.kill()
+            self.process.wait()
+        return False
+
+
+def _probe_cache_key(video_path: Path) -> str:
+    """Cache key that changes whenever the file is rewritten"""
+    stat = video_path.stat()
+    raw = f"{video_path.resolve()}:{stat.st_mtime}:{stat.st_size}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _load_probe_cache() -> dict:
+    """Probe cache contents; a missing or corrupt file counts as empty"""
+    try:
+        cache = json.loads(FFPROBE_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
 def get_video_info(video_path: Path) -> dict:
-    """Get video metadata using ffprobe"""
+    """Get video metadata using ffprobe (cached on disk per file version)"""
+    video_path = Path(video_path)
+    try:
+        key = _probe_cache_key(video_path)
+    except OSError:
+        return {}
+
+    cache = _load_probe_cache()
+    if key in cache:
+        return cache[key]
+
     cmd = [
         "ffprobe",
         "-v", "quiet",
@@ -303,14 +814,24 @@ def get_video_info(video_path: Path) -> dict:
     if result.returncode != 0:
         return {}
     
-    import json
     try:
-        return json.loads(result.stdout)
+        info = json.loads(result.stdout)
     except json.JSONDecodeError:
         return {}
 
+    cache[key] = info
+    # Workers share the file: write a private temp file, then rename it into
+    # place, so readers never see a partial write
+    tmp_path = FFPROBE_CACHE_PATH.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(cache))
+        os.replace(tmp_path, FFPROBE_CACHE_PATH)
+    except OSError:
+        pass  # Cache is best-effort
+    return info
+
 
 if __name__ == "__main__":
     # Test
     print("Fast Renderer - FFmpeg-based video processing")
-    print(f"Default config: {RenderConfig()}")
+    print(f"Default config: {DEFAULT_CONFIG}")
@@ -14,24 +14,184 @@ Usage:
     python main.py --input video.mp4 --topic "health tips" --clips 5
 """
 import argparse
+import hashlib
+from dataclasses import asdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 import os
 import sys
+import threading
+import numpy as np
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress
 
-from config import OUTPUT_DIR, TEMP_DIR, DEFAULT_CLIP_CONFIG
+from config import OUTPUT_DIR, TEMP_DIR, DEFAULT_CLIP_CONFIG, DEFAULT_LLM_CONFIG
 from transcriber import transcribe_video, Transcript
-from analyzer import analyze_transcript, AnalysisResult
-from cropper import generate_crop_trajectory, apply_smart_crop
-from caption_animator import generate_ass_subtitles, STYLES
-from fast_renderer import render_full_clip, RenderConfig
+from analyzer import analyze_transcript, preload_ollama_model, AnalysisResult
+from cropper import generate_crop_trajectory, slice_trajectory, apply_smart_crop, CROP_ENCODE_ARGS
+from caption_animator import generate_ass_subtitles, STYLES, ASS_GENERATOR_VERSION
+from fast_renderer import render_full_clip, burn_subtitles, RenderConfig
 from sfx_engine import SFXEngine
 from broll_engine import BRollEngine, PEXELS_API_KEY
 
 console = Console()
 
+# Encoder threads per ffmpeg; clip workers * threads should roughly match the core count
+FFMPEG_THREADS = 2
+
+
+def _cache_key(*parts) -> str:
+    """Content-addressed name for an intermediate: same inputs -> same file"""
+    return hashlib.blake2b("|".join(str(p) for p in parts).encode(), digest_size=16).hexdigest()
+
+
+def _source_key(path: Path) -> str:
+    stat = path.stat()
+    return _cache_key(path.resolve(), stat.st_mtime, stat.st_size)
+
+
+def _process_one_clip(
+    i: int,
+    clip,
+    input_path: Path,
+    transcript: Transcript,
+    trajectory: list,
+    render_config: RenderConfig,
+    output_dir: Path,
+) -> Path:
+    """
+    Crop, caption and render one clip along a precomputed crop trajectory.
+    The crop and ASS intermediates in TEMP_DIR are named by a hash of their
+    inputs, so re-runs (other topic, more clips, after a crash) reuse them.
+    Each file is written under a .partial name and renamed once complete.
+    """
+    out_w = DEFAULT_CLIP_CONFIG.output_width
+    out_h = DEFAULT_CLIP_CONFIG.output_height
+    
+    # Get words for this clip
+    words = transcript.get_words_in_range(clip.start_time, clip.end_time)
+    
+    # ─────────────────────────────────────────────────────────────────
+    # 3a. Crop video
+    # ─────────────────────────────────────────────────────────────────
+    boxes = np.array([(c["x"], c["y"], c["width"], c["height"]) for c in trajectory], dtype=np.int64)
+    crop_key = _cache_key(
+        _source_key(input_path), clip.start_time, clip.end_time, out_w, out_h,
+        hashlib.blake2b(boxes.tobytes(), digest_size=16).hexdigest(),
+        CROP_ENCODE_ARGS
+    )
+    cropped_path = TEMP_DIR / f"crop_{crop_key}.mp4"
+    if not cropped_path.exists():
+        partial = cropped_path.with_suffix(".partial.mp4")
+        apply_smart_crop(
+            input_path, partial,
+            clip.start_time, clip.end_time,
+            trajectory,
+            out_w,
+            out_h
+        )
+        partial.replace(cropped_path)
+    
+    # ─────────────────────────────────────────────────────────────────
+    # 3b. Generate animated captions (ASS)
+    # ─────────────────────────────────────────────────────────────────
+    # The resolved style and generator version are part of the key, so style or
+    # generator changes don't reuse old captions
+    ass_key = _cache_key(
+        "hormozi", asdict(STYLES["hormozi"]), ASS_GENERATOR_VERSION,
+        out_w, out_h, clip.start_time,
+        [(w.text, w.start, w.end) for w in words]
+    )
+    ass_path = TEMP_DIR / f"captions_{ass_key}.ass"
+    if not ass_path.exists():
+        partial = ass_path.with_suffix(".partial.ass")
+        generate_ass_subtitles(
+            words=words,
+            output_path=partial,
+            style_name="hormozi",
+            video_width=out_w,
+            video_height=out_h,
+            time_offset=clip.start_time
+        )
+        partial.replace(ass_path)
+    
+    # ─────────────────────────────────────────────────────────────────
+    # 3c. Burn captions into video
+    # ─────────────────────────────────────────────────────────────────
+    safe_title = "".join(c if c.isalnum() else "_" for c in clip.title)[:30]
+    final_path = output_dir / f"clip_{i}_{safe_title}.mp4"
+    
+    # Rendered straight into output_dir; only the crop and ASS are cached, so
+    # the final video isn't stored twice
+    partial = final_path.with_suffix(".partial.mp4")
+    # Use fast renderer
+    burn_subtitles(cropped_path, ass_path, partial, render_config)
+    partial.replace(final_path)
+    
+    return final_path
+
+
+def _cluster_clips(clips: list) -> list:
+    """Sweep-line merge of (i, clip) pairs into groups with overlapping time ranges"""
+    clusters = []
+    cluster_end = None
+    for i, clip in sorted(clips, key=lambda item: item[1].start_time):
+        if clusters and clip.start_time <= cluster_end:
+            clusters[-1].append((i, clip))
+            cluster_end = max(cluster_end, clip.end_time)
+        else:
+            clusters.append([(i, clip)])
+            cluster_end = clip.end_time
+    return clusters
+
+
+def _process_clip_cluster(
+    cluster: list,
+    input_path: Path,
+    transcript_path: Path,
+    render_config: RenderConfig,
+    output_dir: Path,
+) -> dict:
+    """
+    Process a group of overlapping clips (runs in a worker process).
+    Face detection runs once over the group's combined span and each clip
+    takes its slice of the trajectory. The transcript is reloaded from disk
+    instead of being pickled across. Returns {clip index: output path}.
+    """
+    transcript = Transcript.load(transcript_path)
+    
+    span_start = min(clip.start_time for _, clip in cluster)
+    span_end = max(clip.end_time for _, clip in cluster)
+    trajectory = generate_crop_trajectory(
+        input_path,
+        span_start,
+        span_end,
+        output_width=DEFAULT_CLIP_CONFIG.output_width,
+        output_height=DEFAULT_CLIP_CONFIG.output_height
+    )
+    
+    # Each clip is two blocking ffmpeg runs (crop, then burn); with two threads
+    # one clip's burn overlaps the next clip's crop
+    finished = {}
+    with ThreadPoolExecutor(max_workers=min(2, len(cluster))) as executor:
+        futures = {
+            executor.submit(
+                _process_one_clip,
+                i, clip, input_path, transcript,
+                slice_trajectory(trajectory, clip.start_time, clip.end_time),
+                render_config, output_dir
+            ): i
+            for i, clip in cluster
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                finished[i] = future.result()
+            except Exception as e:
+                console.print(f"  [red]✗ Clip {i} failed: {e}[/red]")
+    return finished
+
 
 def process_video(
     input_path: Path,
@@ -71,6 +231,14 @@ def process_video(
     output_dir.mkdir(parents=True, exist_ok=True)
     TEMP_DIR.mkdir(parents=True, exist_ok=True)
     
+    # Warm the local LLM while transcription runs, so analysis skips the cold start
+    if llm_provider == "ollama":
+        threading.Thread(
+            target=preload_ollama_model,
+            args=(DEFAULT_LLM_CONFIG.ollama_model,),
+            daemon=True
+        ).start()
+    
     # Initialize engines
     sfx_engine = SFXEngine() if enable_sfx else None
     broll_engine = BRollEngine() if enable_broll and PEXELS_API_KEY else None
@@ -121,72 +289,39 @@ def process_video(
     # ═══════════════════════════════════════════════════════════════════
     console.print(f"\n[bold]✂️ Step 3: Processing {len(analysis.clips)} Clips[/bold]")
     
-    generated_clips = []
     render_config = RenderConfig(
         output_width=DEFAULT_CLIP_CONFIG.output_width,
         output_height=DEFAULT_CLIP_CONFIG.output_height,
+        threads=FFMPEG_THREADS,
     )
     
-    for i, clip in enumerate(analysis.clips, 1):
-        console.print(f"\n[cyan]━━━ Clip {i}/{len(analysis.clips)}: {clip.title} ━━━[/cyan]")
-        console.print(f"[dim]  Time: {clip.start_time:.1f}s - {clip.end_time:.1f}s ({clip.end_time - clip.start_time:.1f}s)[/dim]")
-        console.print(f"[dim]  Score: {clip.virality_score:.0f}/100[/dim]")
-        
-        # Get words for this clip
-        words = transcript.get_words_in_range(clip.start_time, clip.end_time)
-        
-        # ─────────────────────────────────────────────────────────────────
-        # 3a. Generate crop trajectory
-        # ─────────────────────────────────────────────────────────────────
-        console.print("  [dim]→ Analyzing faces for smart crop...[/dim]")
-        trajectory = generate_crop_trajectory(
-            input_path,
-            clip.start_time,
-            clip.end_time,
-            output_width=DEFAULT_CLIP_CONFIG.output_width,
-            output_height=DEFAULT_CLIP_CONFIG.output_height
-        )
-        
-        # ─────────────────────────────────────────────────────────────────
-        # 3b. Crop video
-        # ─────────────────────────────────────────────────────────────────
-        console.print("  [dim]→ Cropping to 9:16...[/dim]")
-        cropped_path = TEMP_DIR / f"clip_{i}_cropped.mp4"
-        apply_smart_crop(
-            input_path, cropped_path,
-            clip.start_time, clip.end_time,
-            trajectory,
-            DEFAULT_CLIP_CONFIG.output_width,
-            DEFAULT_CLIP_CONFIG.output_height
-        )
-        
-        # ─────────────────────────────────────────────────────────────────
-        # 3c. Generate animated captions (ASS)
-        # ─────────────────────────────────────────────────────────────────
-        console.print("  [dim]→ Generating animated captions...[/dim]")
-        ass_path = TEMP_DIR / f"clip_{i}_captions.ass"
-        generate_ass_subtitles(
-            words=words,
-            output_path=ass_path,
-            style_name="hormozi",
-            video_width=DEFAULT_CLIP_CONFIG.output_width,
-            video_height=DEFAULT_CLIP_CONFIG.output_height,
-            time_offset=clip.start_time
-        )
-        
-        # ─────────────────────────────────────────────────────────────────
-        # 3d. Burn captions into video
-        # ─────────────────────────────────────────────────────────────────
-        console.print("  [dim]→ Rendering with captions...[/dim]")
-        safe_title = "".join(c if c.isalnum() else "_" for c in clip.title)[:30]
-        final_path = output_dir / f"clip_{i}_{safe_title}.mp4"
-        
-        # Use fast renderer
-        from fast_renderer import burn_subtitles
-        burn_subtitles(cropped_path, ass_path, final_path, render_config)
-        
-        generated_clips.append(final_path)
-        console.print(f"  [green]✓ Saved: {final_path.name}[/green]")
+    # Overlapping clips share one face-detection pass; clusters are
+    # independent, so run them side by side
+    clips = list(enumerate(analysis.clips, 1))
+    clusters = _cluster_clips(clips)
+    workers = max(1, min(len(clusters), (os.cpu_count() or 1) // FFMPEG_THREADS))
+    console.print(f"[dim]Processing {len(clusters)} clip groups with {workers} parallel workers[/dim]")
+    
+    # One progress bar instead of per-step logging from every worker
+    finished = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor, Progress(console=console) as progress:
+        task = progress.add_task("Rendering clips", total=len(clips))
+        futures = {
+            executor.submit(
+                _process_clip_cluster, cluster,
+                input_path, transcript_path, render_config, output_dir
+            ): cluster
+            for cluster in clusters
+        }
+        for future in as_completed(futures):
+            try:
+                finished.update(future.result())
+            except Exception as e:
+                progress.console.print(f"  [red]✗ Clip group failed: {e}[/red]")
+            progress.advance(task, len(futures[future]))
+    
+    # Keep the clip order from the analysis
+    generated_clips = [finished[i] for i in sorted(finished)]
     
     # ═══════════════════════════════════════════════════════════════════
     # Summary
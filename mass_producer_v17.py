@@ -7,14 +7,26 @@ Builds all 11 viral clips with:
 - Impact font 72pt, MarginV=340
 - 9:16 vertical format (1080x1920)
 """
+import os
 import subprocess
 import json
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Tuple
+import numpy as np
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+from fast_renderer import hw_encoder_args, hwaccel_args
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 console = Console()
 
 # Paths
@@ -30,8 +42,16 @@ OUT_W, OUT_H = 1080, 1920
 FONT_SIZE = 72
 WORDS_PER_LINE = 4
 
-# Word fixes
-WORD_FIXES = {"lair": "Larry", "Lair": "Larry", "viral": "vial", "larry": "Larry"}
+# libx264 threads per ffmpeg; workers * threads should roughly match the core count
+FFMPEG_THREADS = 2
+
+
+def _enc_flags() -> List[str]:
+    """Hardware H.264 encode (VideoToolbox/NVENC) when available, libx264 otherwise"""
+    return hw_encoder_args() or ["-c:v", "libx264", "-preset", "fast", "-crf", "18"]
+
+# Word fixes, keyed by lower-cased word
+WORD_FIXES = {"lair": "Larry", "viral": "vial"}
 
 # All 11 clips with their configurations
 CLIPS = [
@@ -125,33 +145,76 @@ CLIPS = [
     }
 ]
 
-def fix_word(word: str) -> str:
-    return WORD_FIXES.get(word, word)
-
 def load_transcript() -> Dict:
+    if HAS_ORJSON:
+        with open(TRANSCRIPT_PATH, 'rb') as f:
+            return orjson.loads(f.read())
     with open(TRANSCRIPT_PATH) as f:
         return json.load(f)
 
-def get_words(transcript: Dict, start: float, end: float) -> List[Dict]:
-    words = []
-    duration = end - start
+@dataclass
+class WordIndex:
+    """Transcript words flattened into time-ordered arrays (texts already fixed + uppercased)"""
+    starts: np.ndarray
+    ends: np.ndarray
+    texts: np.ndarray
+
+def index_words(transcript: Dict) -> WordIndex:
+    """Flatten all segment words once so each clip lookup is a binary search"""
+    starts, ends, texts = [], [], []
     for seg in transcript['segments']:
-        if 'words' not in seg:
-            continue
-        for w in seg['words']:
-            if w['end'] > start and w['start'] < end:
-                text = fix_word(w['text'].strip())
-                if not text:
-                    continue
-                rel_start = max(0.0, round(w['start'] - start, 3))
-                rel_end = min(duration, round(w['end'] - start, 3))
-                if rel_end > rel_start:
-                    words.append({
-                        'text': text.upper(),
-                        'start': rel_start,
-                        'end': rel_end,
-                    })
-    return words
+        for w in seg.get('words', []):
+            text = w['text'].strip()
+            if not text:
+                continue
+            starts.append(w['start'])
+            ends.append(w['end'])
+            # Uppercase in Python: np.char.upper keeps the fixed <U width and
+            # truncates words that grow ("straße" -> "STRASS")
+            texts.append(WORD_FIXES.get(text.lower(), text).upper())
+    return WordIndex(
+        starts=np.asarray(starts, dtype=np.float64),
+        ends=np.asarray(ends, dtype=np.float64),
+        texts=np.asarray(texts, dtype=object),
+    )
+
+def load_words_index() -> WordIndex:
+    """index_words over the transcript, cached as .npz until the transcript or WORD_FIXES change"""
+    cache_path = TEMP_DIR / f"{TRANSCRIPT_PATH.stem}_words.npz"
+    # Versioned so caches written by the truncating np.char.upper index are rebuilt
+    fixes_key = "v2:" + json.dumps(WORD_FIXES, sort_keys=True)
+    
+    if cache_path.exists() and cache_path.stat().st_mtime >= TRANSCRIPT_PATH.stat().st_mtime:
+        with np.load(cache_path) as cached:
+            if str(cached['fixes']) == fixes_key:
+                return WordIndex(starts=cached['starts'], ends=cached['ends'], texts=cached['texts'].astype(object))
+    
+    index = index_words(load_transcript())
+    # Stored as <U (sized to the longest word, so nothing is cut) to avoid pickling
+    np.savez(cache_path, starts=index.starts, ends=index.ends, texts=index.texts.astype(str), fixes=np.array(fixes_key))
+    return index
+
+def get_words(index: WordIndex, start: float, end: float) -> List[Dict]:
+    duration = end - start
+    
+    # Words are time-ordered: narrow to a slice, then mask for exact overlap
+    lo = int(np.searchsorted(index.ends, start, side='right'))
+    hi = int(np.searchsorted(index.starts, end, side='left'))
+    if hi <= lo:
+        return []
+    
+    starts = index.starts[lo:hi]
+    ends = index.ends[lo:hi]
+    overlap = (ends > start) & (starts < end)
+    rel_starts = np.maximum(0.0, np.round(starts - start, 3))
+    rel_ends = np.minimum(duration, np.round(ends - start, 3))
+    keep = np.nonzero(overlap & (rel_ends > rel_starts))[0]
+    
+    texts = index.texts[lo:hi].tolist()
+    return [
+        {'text': texts[i], 'start': float(rel_starts[i]), 'end': float(rel_ends[i])}
+        for i in keep
+    ]
 
 def group_words_into_lines(words: List[Dict], words_per_line: int = 4) -> List[List[Dict]]:
     lines = []
@@ -159,22 +222,15 @@ def group_words_into_lines(words: List[Dict], words_per_line: int = 4) -> List[L
         lines.append(words[i:i + words_per_line])
     return lines
 
-def format_ass_time(seconds: float) -> str:
-    h = int(seconds // 3600)
-    m = int((seconds % 3600) // 60)
-    s = int(seconds % 60)
-    cs = int((seconds % 1) * 100)
-    return f"{h}:{m:02d}:{s:02d}.{cs:02d}"
+# ASS colours (&HAABBGGRR) and the karaoke highlight override tags
+ASS_WHITE = "&H00FFFFFF"
+ASS_BLACK = "&H00000000"
+ASS_RED = "&H003D1CE3"
+HIGHLIGHT_PREFIX = f"{{\\3c{ASS_RED}\\bord14\\shad6}}"
+HIGHLIGHT_SUFFIX = f"{{\\3c{ASS_BLACK}\\bord6\\shad6}}"
 
-def generate_ass_subtitles(lines: List[List[Dict]], output_path: Path, duration: float, 
-                           title_line1: str, title_line2: str):
-    """Generate ASS with karaoke captions and top title"""
-    
-    white = "&H00FFFFFF"
-    black = "&H00000000"
-    red = "&H003D1CE3"
-    
-    ass_content = f"""[Script Info]
+# Script info + styles only depend on module constants, so build them once
+ASS_HEADER = f"""[Script Info]
 Title: Karaoke Viral Clip
 ScriptType: v4.00+
 PlayResX: {OUT_W}
@@ -183,91 +239,87 @@ WrapStyle: 0
 
 [V4+ Styles]
 Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
-Style: Default,Impact,{FONT_SIZE},{white},{white},{black},{black},-1,0,0,0,100,100,0,0,1,6,6,2,10,10,340,1
-Style: TopTitle,Arial,42,{white},{white},{black},{black},-1,0,0,0,100,100,0,0,1,4,2,8,20,20,50,1
+Style: Default,Impact,{FONT_SIZE},{ASS_WHITE},{ASS_WHITE},{ASS_BLACK},{ASS_BLACK},-1,0,0,0,100,100,0,0,1,6,6,2,10,10,340,1
+Style: TopTitle,Arial,42,{ASS_WHITE},{ASS_WHITE},{ASS_BLACK},{ASS_BLACK},-1,0,0,0,100,100,0,0,1,4,2,8,20,20,50,1
 
 [Events]
-Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
-"""
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text"""
+
+def format_ass_time(seconds: float) -> str:
+    h = int(seconds // 3600)
+    m = int((seconds % 3600) // 60)
+    s = int(seconds % 60)
+    cs = int((seconds % 1) * 100)
+    return f"{h}:{m:02d}:{s:02d}.{cs:02d}"
+
+def generate_ass_subtitles(lines: List[List[Dict]], output_path: Path, duration: float, 
+                           title_line1: str, title_line2: str):
+    """Generate ASS with karaoke captions and top title"""
     
-    events = []
+    events = [ASS_HEADER]
     
     # Top title (persists entire video)
     end_time = format_ass_time(duration)
     events.append(f"Dialogue: 0,0:00:00.00,{end_time},TopTitle,,0,0,0,,{title_line1}\\N{title_line2}")
     
-    # Karaoke captions
+    # Karaoke captions: one event per word, with that word highlighted
     for line in lines:
         if not line:
             continue
         
+        texts = [w['text'] for w in line]
         for word_idx, current_word in enumerate(line):
             word_start = format_ass_time(current_word['start'])
             word_end = format_ass_time(current_word['end'])
             
-            text_parts = []
-            for i, w in enumerate(line):
-                if i == word_idx:
-                    text_parts.append(f"{{\\3c{red}\\bord14\\shad6}}{w['text']}{{\\3c{black}\\bord6\\shad6}}")
-                else:
-                    text_parts.append(w['text'])
-            
-            line_text = " ".join(text_parts)
-            events.append(f"Dialogue: 0,{word_start},{word_end},Default,,0,0,0,,{line_text}")
-    
-    ass_content += "\n".join(events)
+            parts = texts.copy()
+            parts[word_idx] = HIGHLIGHT_PREFIX + texts[word_idx] + HIGHLIGHT_SUFFIX
+            events.append(f"Dialogue: 0,{word_start},{word_end},Default,,0,0,0,,{' '.join(parts)}")
     
     with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(ass_content)
+        f.write("\n".join(events))
 
-def extract_base_video(start: float, end: float, output: Path) -> Path:
-    """Extract and crop video to 9:16"""
-    duration = end - start
-    raw_path = TEMP_DIR / "temp_raw.mp4"
-    
-    subprocess.run([
-        "ffmpeg", "-y", "-ss", str(start), "-i", str(VIDEO_PATH),
-        "-t", str(duration), "-c:v", "libx264", "-preset", "fast", "-crf", "18",
-        "-c:a", "aac", "-b:a", "192k", str(raw_path)
-    ], capture_output=True, check=True)
-    
+def _run_ffmpeg(cmd: List[str]):
+    """Run ffmpeg quietly; stderr is only read (and raised) on failure"""
+    cmd = [cmd[0], "-hide_banner", "-nostats", "-loglevel", "error", *cmd[1:]]
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg error: {result.stderr[-2000:].decode(errors='ignore')}")
+
+def probe_source_crop() -> Tuple[int, int, int]:
+    """Probe the source once and return the 9:16 (+25%) center crop as (crop_w, crop_h, crop_x)"""
     res = subprocess.run([
         "ffprobe", "-v", "error", "-select_streams", "v:0",
-        "-show_entries", "stream=width,height", "-of", "csv=p=0", str(raw_path)
-    ], capture_output=True, text=True)
+        "-show_entries", "stream=width,height", "-of", "csv=p=0", str(VIDEO_PATH)
+    ], capture_output=True, text=True, check=True)
     w, h = map(int, res.stdout.strip().split(','))
     
     crop_w = min(int((h * 9 / 16) * 1.25), w)
     crop_x = (w - crop_w) // 2
-    
-    subprocess.run([
-        "ffmpeg", "-y", "-i", str(raw_path),
-        "-vf", f"crop={crop_w}:{h}:{crop_x}:0,scale={OUT_W}:{OUT_H}:force_original_aspect_ratio=decrease,pad={OUT_W}:{OUT_H}:(ow-iw)/2:(oh-ih)/2:black",
-        "-c:v", "libx264", "-preset", "fast", "-crf", "18",
-        "-c:a", "copy", str(output)
-    ], capture_output=True, check=True)
-    
-    return output
+    return crop_w, h, crop_x
 
-def burn_subtitles(video_path: Path, ass_path: Path, output_path: Path) -> Path:
-    """Burn ASS subtitles into video"""
-    cmd = [
-        "ffmpeg", "-y", "-i", str(video_path),
-        "-vf", f"ass={ass_path}",
-        "-c:v", "libx264", "-preset", "fast", "-crf", "18",
-        "-c:a", "copy",
-        str(output_path)
-    ]
-    
-    result = subprocess.run(cmd, capture_output=True)
-    
-    if result.returncode != 0:
-        raise Exception(f"FFmpeg error: {result.stderr.decode()[:500]}")
-    
-    return output_path
+# Clips whose ranges overlap or sit within this many seconds share one decode.
+# CLIP_GROUP_MAX_GAP=inf renders every clip from a single ffmpeg process (one
+# split graph over the whole span), which pays off when the clips are dense
+# enough that the gaps cost less to decode than the extra process startups.
+GROUP_MAX_GAP = float(os.environ.get("CLIP_GROUP_MAX_GAP", 5.0))
+
+def group_nearby_clips(clips: List[Dict], max_gap: float = GROUP_MAX_GAP) -> List[List[Dict]]:
+    """
+    Group clips whose source ranges overlap or nearly touch.
+    Each group is rendered from a single seek + decode of its combined span;
+    far-apart clips stay separate so nothing between them gets decoded.
+    """
+    groups = []
+    for clip in sorted(clips, key=lambda c: c['start']):
+        if groups and clip['start'] - max(c['end'] for c in groups[-1]) <= max_gap:
+            groups[-1].append(clip)
+        else:
+            groups.append([clip])
+    return groups
 
-def build_clip(clip_config: Dict, transcript: Dict) -> Path:
-    """Build a single clip with all effects"""
+def prepare_captions(clip_config: Dict, words_index: WordIndex) -> Path:
+    """Write the clip's karaoke ASS file, or return None if it has no words"""
     clip_id = clip_config['clip_id']
     name = clip_config['name']
     start = clip_config['start']
@@ -280,7 +332,7 @@ def build_clip(clip_config: Dict, transcript: Dict) -> Path:
     console.print(f"  Duration: {duration:.1f}s | Title: {title1}")
     
     # Get words
-    words = get_words(transcript, start, end)
+    words = get_words(words_index, start, end)
     if not words:
         console.print(f"  [yellow]Warning: No words found for clip {clip_id}[/yellow]")
         return None
@@ -291,18 +343,65 @@ def build_clip(clip_config: Dict, transcript: Dict) -> Path:
     # Generate ASS
     ass_path = TEMP_DIR / f"{name}.ass"
     generate_ass_subtitles(lines, ass_path, duration, title1, title2)
+    return ass_path
+
+def build_clip_group(group: List[Dict], words_index: WordIndex, crop: Tuple[int, int, int]) -> List[str]:
+    """
+    Build a group of nearby clips with one ffmpeg call: seek once to the
+    group's span, split the decoded stream, and trim/crop/scale/pad/caption
+    each branch into its own output. Returns the names of the built clips.
+    
+    -ss before -i makes the demuxer jump to the nearest keyframe, so only the
+    group's own span is read and decoded. A single sequential pass over the
+    source (e.g. pre-splitting with the segment muxer) would read the whole
+    two-hour file to use a few minutes of it, and stream-copied segments
+    can only start on keyframes, so it does not pay off here.
+    """
+    clips = [(clip, prepare_captions(clip, words_index)) for clip in group]
+    clips = [(clip, ass_path) for clip, ass_path in clips if ass_path]
+    if not clips:
+        return []
     
-    # Extract base video
-    base_path = TEMP_DIR / f"{name}_base.mp4"
-    extract_base_video(start, end, base_path)
-    console.print(f"  ✓ Extracted base video")
+    span_start = min(clip['start'] for clip, _ in clips)
+    span_end = max(clip['end'] for clip, _ in clips)
+    crop_w, crop_h, crop_x = crop
+    n = len(clips)
     
-    # Burn subtitles
-    final_path = OUTPUT_DIR / f"{name}.mp4"
-    burn_subtitles(base_path, ass_path, final_path)
-    console.print(f"  ✓ Burned captions → {final_path.name}")
+    graph = [
+        "[0:v]split=" + str(n) + "".join(f"[vin{i}]" for i in range(n)),
+        "[0:a]asplit=" + str(n) + "".join(f"[ain{i}]" for i in range(n)),
+    ]
+    outputs = []
+    for i, (clip, ass_path) in enumerate(clips):
+        start = clip['start'] - span_start
+        end = clip['end'] - span_start
+        graph.append(
+            f"[vin{i}]trim=start={start}:end={end},setpts=PTS-STARTPTS,"
+            f"crop={crop_w}:{crop_h}:{crop_x}:0,scale={OUT_W}:{OUT_H}:force_original_aspect_ratio=decrease,"
+            f"pad={OUT_W}:{OUT_H}:(ow-iw)/2:(oh-ih)/2:black,ass={ass_path}[v{i}]"
+        )
+        graph.append(f"[ain{i}]atrim=start={start}:end={end},asetpts=PTS-STARTPTS[a{i}]")
+        
+        final_path = OUTPUT_DIR / f"{clip['name']}.mp4"
+        outputs.extend([
+            "-map", f"[v{i}]", "-map", f"[a{i}]",
+            *_enc_flags(),
+            "-threads", str(FFMPEG_THREADS),
+            "-c:a", "aac", "-b:a", "192k",
+            str(final_path)
+        ])
     
-    return final_path
+    _run_ffmpeg([
+        "ffmpeg", "-y", *hwaccel_args(),
+        # Input options: decode only the span the group's clips cover
+        "-ss", str(span_start), "-t", str(span_end - span_start), "-i", str(VIDEO_PATH),
+        "-filter_complex", ";".join(graph),
+        *outputs
+    ])
+    
+    names = [clip['name'] for clip, _ in clips]
+    console.print(f"  ✓ Rendered with captions → {', '.join(names)}")
+    return names
 
 def main():
     console.print(Panel.fit(
@@ -315,21 +414,31 @@ def main():
     
     # Load transcript once
     console.print("\n[bold]Loading transcript...[/bold]")
-    transcript = load_transcript()
-    console.print("  ✓ Transcript loaded")
+    words_index = load_words_index()
+    console.print(f"  ✓ Transcript loaded ({len(words_index.texts)} words)")
+    
+    # Same source for every clip, so probe its crop once
+    crop = probe_source_crop()
     
     # Build all clips
     successful = []
     failed = []
     
-    for clip in CLIPS:
-        try:
-            result = build_clip(clip, transcript)
-            if result:
-                successful.append(clip['name'])
-        except Exception as e:
-            console.print(f"  [red]✗ Error: {e}[/red]")
-            failed.append(clip['name'])
+    # Overlapping clips share a decode; groups are independent, so run them side by side
+    groups = group_nearby_clips(CLIPS)
+    workers = max(1, min(len(groups), (os.cpu_count() or 1) // FFMPEG_THREADS))
+    console.print(f"  Building {len(CLIPS)} clips in {len(groups)} groups with {workers} parallel workers")
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(build_clip_group, group, words_index, crop): group for group in groups}
+        for future in as_completed(futures):
+            group = futures[future]
+            try:
+                successful.extend(future.result())
+            except Exception as e:
+                names = [clip['name'] for clip in group]
+                console.print(f"  [red]✗ Error ({', '.join(names)}): {e}[/red]")
+                failed.extend(names)
     
     # Summary
     console.print(Panel.fit(
@@ -3,7 +3,13 @@
 Premium VFX Video Compositor
 Builds viral clips with image overlays, effects, and captions
 """
+import hashlib
 import json
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Tuple, Optional
 import numpy as np
@@ -16,6 +22,8 @@ import cv2
 from rich.console import Console
 from rich.progress import track
 
+from fast_renderer import hw_encoder_args, video_codec_args, RenderConfig
+
 console = Console()
 
 # Asset paths
@@ -25,25 +33,61 @@ TEMP_DIR = Path("/Users/salmaanrauf/Documents/Other/viral_clip_generator/temp")
 VIDEO_PATH = Path("/Users/salmaanrauf/Documents/Other/Podcast w Dr Abud.mp4")
 
 OUTPUT_DIR.mkdir(exist_ok=True)
+TEMP_DIR.mkdir(exist_ok=True)
+CAPTION_CACHE_DIR = TEMP_DIR / "cap_cache"
+CAPTION_CACHE_DIR.mkdir(exist_ok=True)
 
 # Output dimensions (9:16 vertical)
 OUT_W, OUT_H = 1080, 1920
 
+# Clips build in parallel processes; split the cores between their encoders
+BUILD_WORKERS = max(1, min(6, (os.cpu_count() or 2) // 2))
+ENCODE_THREADS = max(1, (os.cpu_count() or 1) // BUILD_WORKERS)
+
+# Even-width 9:16 center crop of the source, then scale to the output size
+VERTICAL_FILTER = f"crop=trunc(ih*9/32)*2:ih:(iw-trunc(ih*9/32)*2)/2:0,scale={OUT_W}:{OUT_H},setsar=1"
+
+# USE_CPU_ENCODE=1 pins every encode to libx264 instead of VideoToolbox/NVENC
+USE_CPU_ENCODE = os.environ.get("USE_CPU_ENCODE") == "1"
+
+# Intermediate cuts: fast and near-lossless, the real encode happens in _write
+EXTRACT_CONFIG = RenderConfig(preset="ultrafast", crf=18, threads=ENCODE_THREADS, use_hwenc=not USE_CPU_ENCODE)
+
+# Margin above/below caption text so the outline and descenders aren't clipped
+CAPTION_PAD = 10
+# Widest a caption line may get before wrapping (leaves a side margin)
+CAPTION_MAX_WIDTH = OUT_W - 120
+CAPTION_FONT_PATH = Path("/System/Library/Fonts/Supplemental/Arial Rounded Bold.ttf")
+CAPTION_FONT_SIZE = 70
+CAPTION_LINE_HEIGHT = 80
+CAPTION_STROKE_WIDTH = 3
+# Caption color names drawn with a different fill
+CAPTION_COLOR_FILLS = {"yellow": "#FFD700"}
+# Bump when _render_caption changes in a way the parameters above don't capture
+CAPTION_RENDER_VERSION = 1
+
+
+# Scanned once; every overlay lookup matches against this list
+_ASSET_INDEX: List[Path] = list(ASSET_DIR.glob("*.png"))
+
 
 def load_asset(name_pattern: str) -> Optional[Path]:
     """Find asset by partial name match"""
-    matches = list(ASSET_DIR.glob(f"*{name_pattern}*.png"))
-    return matches[0] if matches else None
+    return next((p for p in _ASSET_INDEX if name_pattern in p.stem), None)
 
 
 def create_overlay_image(asset_path: Path, size: Tuple[int, int], 
-                         position: str = "center", opacity: float = 0.9) -> ImageClip:
-    """Create an overlay from an asset image, scaled and positioned"""
+                         position: str = "center", opacity: float = 0.9,
+                         resample: Image.Resampling = Image.Resampling.BICUBIC) -> ImageClip:
+    """
+    Create an overlay from an asset image, scaled and positioned.
+    BICUBIC is indistinguishable from LANCZOS for a short on-screen overlay at ~2x the speed.
+    """
     img = Image.open(asset_path).convert("RGBA")
     
     # Scale to fit within bounds while maintaining aspect ratio
     target_w, target_h = size
-    img.thumbnail((target_w, target_h), Image.Resampling.LANCZOS)
+    img.thumbnail((target_w, target_h), resample)
     
     # Create canvas at full video size
     canvas = Image.new('RGBA', (OUT_W, OUT_H), (0, 0, 0, 0))
@@ -61,34 +105,110 @@ def create_overlay_image(asset_path: Path, size: Tuple[int, int],
     
     canvas.paste(img, (x, y), img)
     
-    # Apply opacity
-    if opacity < 1.0:
-        alpha = canvas.split()[3]
-        alpha = alpha.point(lambda p: int(p * opacity))
-        canvas.putalpha(alpha)
+    # Apply opacity (8.8 fixed-point multiply on the alpha plane); only
+    # that path needs a writable copy, otherwise wrap PIL's exported bytes as-is
+    if opacity >= 1.0:
+        return ImageClip(np.asarray(canvas))
+    
+    arr = np.array(canvas)
+    alpha = arr[..., 3]
+    alpha[:] = (alpha.astype(np.uint16) * int(opacity * 256)) >> 8
     
-    return ImageClip(np.array(canvas))
+    return ImageClip(arr)
 
 
-def add_bold_caption(text: str, duration: float, start: float,
-                     color: str = "yellow", position: str = "bottom") -> ImageClip:
-    """Create bold caption overlay"""
-    img = Image.new('RGBA', (OUT_W, OUT_H), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
+@lru_cache(maxsize=4)
+def _get_font(size: int = CAPTION_FONT_SIZE):
+    """Caption font, loaded once per size"""
     try:
-        font = ImageFont.truetype("/System/Library/Fonts/Supplemental/Arial Rounded Bold.ttf", 70)
-    except:
-        font = ImageFont.load_default()
+        return ImageFont.truetype(str(CAPTION_FONT_PATH), size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=1)
+def _font_identity() -> str:
+    """Resolved caption font path and mtime, so cached captions follow font changes"""
+    try:
+        path = CAPTION_FONT_PATH.resolve()
+        return f"{path}|{path.stat().st_mtime_ns}"
+    except OSError:
+        return "default"
+
+
+@lru_cache(maxsize=1024)
+def _word_length(word: str, size: int = CAPTION_FONT_SIZE) -> float:
+    """Advance width of one caption word (cached across captions and clips)"""
+    return _get_font(size).getlength(word)
+
+
+def _wrap(text: str, max_width: int, size: int = CAPTION_FONT_SIZE) -> List[Tuple[str, int]]:
+    """
+    Greedy word wrap on real glyph advances rather than character counts.
+    Returns (line, x) pairs with x already centering the line on the frame.
+    """
+    space = _word_length(" ", size)
+    lines = []
+    words, width = [], 0.0
+    for word in text.split():
+        w = _word_length(word, size)
+        if words and width + space + w > max_width:
+            lines.append((words, width))
+            words, width = [], 0.0
+        width += (space if words else 0.0) + w
+        words.append(word)
+    if words:
+        lines.append((words, width))
+    return [(" ".join(ws), int(OUT_W - width) // 2) for ws, width in lines]
+
+
+def _render_caption(text: str, color: str) -> Image.Image:
+    """Rasterize a caption onto a strip just tall enough for its lines"""
+    font = _get_font()
     
     # Wrap text
-    import textwrap
-    lines = textwrap.wrap(text, width=25)
+    lines = _wrap(text, CAPTION_MAX_WIDTH)
+    line_height = CAPTION_LINE_HEIGHT
     
-    # Calculate position
-    line_height = 80
-    total_height = len(lines) * line_height
+    img = Image.new('RGBA', (OUT_W, len(lines) * line_height + 2 * CAPTION_PAD), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    
+    # Draw each line
+    for i, (line, x) in enumerate(lines):
+        y = CAPTION_PAD + i * line_height
+        
+        # Draw fill with a black outline in one pass
+        fill_color = CAPTION_COLOR_FILLS.get(color, color)
+        draw.text((x, y), line, font=font, fill=fill_color,
+                  stroke_width=CAPTION_STROKE_WIDTH, stroke_fill="black")
     
+    return img
+
+
+def add_bold_caption(text: str, duration: float, start: float,
+                     color: str = "yellow", position: str = "bottom") -> ImageClip:
+    """
+    Create bold caption overlay (a strip just tall enough for the text, positioned on the frame).
+    Rendered strips persist in CAPTION_CACHE_DIR, so re-runs skip rasterization.
+    """
+    # Every parameter that changes the rendered PNG is part of the key
+    render_params = (
+        text, CAPTION_COLOR_FILLS.get(color, color), CAPTION_FONT_SIZE, CAPTION_LINE_HEIGHT,
+        CAPTION_PAD, CAPTION_STROKE_WIDTH, CAPTION_MAX_WIDTH, OUT_W, _font_identity(),
+        CAPTION_RENDER_VERSION,
+    )
+    key = hashlib.sha1("|".join(map(str, render_params)).encode()).hexdigest()
+    cache_path = CAPTION_CACHE_DIR / f"{key}.png"
+    if cache_path.exists():
+        img = Image.open(cache_path)
+    else:
+        img = _render_caption(text, color)
+        # Write then rename, so a parallel build never reads a half-written PNG
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        img.save(tmp_path, format="PNG", compress_level=1)
+        tmp_path.replace(cache_path)
+    
+    total_height = img.height - 2 * CAPTION_PAD
     if position == "bottom":
         y_start = OUT_H - total_height - 350
     elif position == "top":
@@ -96,345 +216,292 @@ def add_bold_caption(text: str, duration: float, start: float,
     else:
         y_start = (OUT_H - total_height) // 2
     
-    # Draw each line
-    for i, line in enumerate(lines):
-        bbox = draw.textbbox((0, 0), line, font=font)
-        text_w = bbox[2] - bbox[0]
-        x = (OUT_W - text_w) // 2
-        y = y_start + i * line_height
-        
-        # Draw stroke
-        for dx in [-3, -2, 0, 2, 3]:
-            for dy in [-3, -2, 0, 2, 3]:
-                draw.text((x + dx, y + dy), line, font=font, fill="black")
-        
-        # Draw fill
-        fill_color = color if color != "yellow" else "#FFD700"
-        draw.text((x, y), line, font=font, fill=fill_color)
-    
-    clip = ImageClip(np.array(img)).with_duration(duration).with_start(start)
+    clip = (
+        ImageClip(np.asarray(img))  # Wraps PIL's exported bytes without a second copy; MoviePy only reads it
+        .with_duration(duration)
+        .with_start(start)
+        .with_position((0, y_start - CAPTION_PAD))
+    )
     return clip
 
 
+@dataclass(frozen=True)
+class EncoderArgs:
+    """
+    ffmpeg encoder choices, resolved once in the parent (the probes run
+    `ffmpeg -encoders`) and handed to build workers
+    """
+    extract: Tuple[str, ...]               # video codec args for _extract
+    final_hw: Optional[Tuple[str, ...]]    # ["-c:v", codec, ...] for _write, None for libx264
+
+
+def resolve_encoder_args() -> EncoderArgs:
+    """Probe for hardware encoders and build the extract/final encoder args"""
+    final_hw = None if USE_CPU_ENCODE else hw_encoder_args("6M")
+    return EncoderArgs(
+        extract=tuple(video_codec_args(EXTRACT_CONFIG)),
+        final_hw=tuple(final_hw) if final_hw else None,
+    )
+
+
+def _extract(start: float, end: float, idx: int, codec_args: Tuple[str, ...]) -> Path:
+    """
+    Cut [start, end] of the podcast, center-cropped to 9:16 and scaled to
+    OUT_W x OUT_H in the same ffmpeg pass, so MoviePy only decodes a short,
+    ready-to-composite file instead of cropping/resizing every frame in Python
+    """
+    out = TEMP_DIR / f"src_{idx}.mp4"
+    cmd = [
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+        "-ss", str(start),
+        "-i", str(VIDEO_PATH),
+        "-t", str(end - start),
+        "-vf", VERTICAL_FILTER,
+        *codec_args,
+        "-c:a", "copy",
+        str(out)
+    ]
+    
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg extract failed: {result.stderr}")
+    return out
+
+
 def apply_grayscale_effect(clip: VideoFileClip) -> VideoFileClip:
     """Apply black and white effect to video"""
     def to_gray(frame):
+        # One SIMD luma pass, then replicate the plane instead of a second cvtColor
         gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
-        return cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
-    return clip.transform(to_gray)
+        return np.broadcast_to(gray[..., None], frame.shape).copy()
+    # image_transform hands the callable just the frame (transform passes get_frame, t)
+    return clip.image_transform(to_gray)
 
 
-def build_clip_1_purple_tricep():
-    """Build Clip 1: Purple Tricep with Larry Wheels"""
-    console.print("[cyan]Building Clip 1: Purple Tricep (Larry Wheels)[/cyan]")
-    
-    # Load base video segment
-    video = VideoFileClip(str(VIDEO_PATH)).subclipped(3938.0, 3977.0)
-    
-    # Smart crop to vertical (center)
-    w, h = video.size
-    crop_w = int(h * 9 / 16)
-    x_center = w // 2
-    video = video.cropped(x1=x_center - crop_w//2, x2=x_center + crop_w//2)
-    video = video.resized((OUT_W, OUT_H))
-    
-    layers = [video]
-    
-    # Add warning overlay at start (0-2s)
-    warning_asset = load_asset("warning_graphic")
-    if warning_asset:
-        warning = create_overlay_image(warning_asset, (800, 400), position="center")
-        warning = warning.with_duration(2.0).with_start(0)
-        layers.append(warning)
-    
-    # Add purple bruise overlay (5-10s) 
-    bruise_asset = load_asset("purple_bruise")
-    if bruise_asset:
-        bruise = create_overlay_image(bruise_asset, (600, 600), position="center", opacity=0.7)
-        bruise = bruise.with_duration(5.0).with_start(5.0)
-        layers.append(bruise)
-    
-    # Add calendar flip (25-30s)
-    calendar_asset = load_asset("calendar_week")
-    if calendar_asset:
-        calendar = create_overlay_image(calendar_asset, (700, 500), position="center")
-        calendar = calendar.with_duration(5.0).with_start(25.0)
-        layers.append(calendar)
-    
-    # Add captions
-    captions = [
-        ("I was lifting with LARRY WHEELS", 0, 4, "white"),
-        ("My tricep... PURPLE from here to here", 5, 10, "yellow"),
-        ("I put BPC RIGHT INTO THE TENDON", 12, 17, "white"),
-        ("4 WEEKS LATER... WE'RE BACK", 25, 30, "yellow"),
-    ]
-    
-    for text, start, end, color in captions:
-        cap = add_bold_caption(text, end - start, start, color=color)
-        layers.append(cap)
-    
-    # Final hook caption
-    hook = add_bold_caption("My Arm was PURPLE 🟣 -> Healed in 4 Weeks", 
-                           5.0, video.duration - 5, color="yellow")
-    layers.append(hook)
-    
-    # Composite
-    final = CompositeVideoClip(layers)
-    output_path = OUTPUT_DIR / "clip_1_purple_tricep_vfx.mp4"
-    final.write_videofile(str(output_path), fps=30, codec='libx264', audio_codec='aac')
-    console.print(f"[green]✓ Saved: {output_path.name}[/green]")
-    return output_path
+def _write(final: CompositeVideoClip, output_path: Path, hw_args: Optional[Tuple[str, ...]]):
+    """
+    Encode a composited clip on VideoToolbox/NVENC when available (hw_args),
+    else with libx264 (ENCODE_THREADS per parallel build)
+    """
+    codec, codec_params = 'libx264', []
+    if hw_args:
+        codec, codec_params = hw_args[1], list(hw_args[2:])
+    final.write_videofile(
+        str(output_path), fps=30, codec=codec, audio_codec='aac',
+        threads=ENCODE_THREADS, preset='veryfast',
+        ffmpeg_params=[*codec_params, '-pix_fmt', 'yuv420p', '-movflags', '+faststart']
+    )
 
 
-def build_clip_2_rat_acl():
-    """Build Clip 2: Rat ACL Experiment"""
-    console.print("[cyan]Building Clip 2: Rat ACL Experiment[/cyan]")
-    
-    # Load video segment (timestamps from user brief: 38:25 - 38:34 = 2305s - 2314s)
-    video = VideoFileClip(str(VIDEO_PATH)).subclipped(2305.0, 2334.0)
-    
-    # Smart crop
-    w, h = video.size
-    crop_w = int(h * 9 / 16)
-    x_center = w // 2
-    video = video.cropped(x1=x_center - crop_w//2, x2=x_center + crop_w//2)
-    video = video.resized((OUT_W, OUT_H))
-    
-    layers = [video]
-    
-    # Add torn rope overlay (5-10s)
-    rope_torn = load_asset("torn_rope")
-    if rope_torn:
-        rope = create_overlay_image(rope_torn, (800, 600), position="center")
-        rope = rope.with_duration(5.0).with_start(5.0)
-        layers.append(rope)
-    
-    # Add healing rope (15-20s)
-    rope_heal = load_asset("rope_healing")
-    if rope_heal:
-        heal = create_overlay_image(rope_heal, (800, 600), position="center")
-        heal = heal.with_duration(5.0).with_start(15.0)
-        layers.append(heal)
-    
-    # Captions
-    captions = [
-        ("They BLEW OUT the ACL of these rats", 0, 5, "white"),
-        ("Injected BPC-157...", 6, 10, "yellow"),
-        ("100% REGROWTH", 15, 20, "yellow"),
-        ("The ligament GREW BACK 🤯", 20, 25, "white"),
-    ]
-    
-    for text, start, end, color in captions:
-        cap = add_bold_caption(text, end - start, start, color=color)
-        layers.append(cap)
-    
-    # Final hook
-    hook = add_bold_caption("They severed a Rat's ACL 🐀 and it GREW BACK", 
-                           5.0, video.duration - 5, color="yellow")
-    layers.append(hook)
-    
-    final = CompositeVideoClip(layers)
-    output_path = OUTPUT_DIR / "clip_2_rat_acl_vfx.mp4"
-    final.write_videofile(str(output_path), fps=30, codec='libx264', audio_codec='aac')
-    console.print(f"[green]✓ Saved: {output_path.name}[/green]")
-    return output_path
+def _flatten_overlays(layers: list) -> list:
+    """
+    Pre-composite static overlays that share a (start, end) window into one
+    RGBA ImageClip, so CompositeVideoClip blends once per window per frame
+    instead of once per overlay. A clip only joins an earlier group when no
+    layer stacked in between overlaps it in time, so z-order is unchanged.
+    """
+    base, *overlays = layers
+    groups = []
+    for clip in overlays:
+        window = (clip.start, clip.end)
+        for i in range(len(groups) - 1, -1, -1):
+            if groups[i][0] == window:
+                groups[i][1].append(clip)
+                break
+            other_start, other_end = groups[i][0]
+            if other_start < clip.end and clip.start < other_end:
+                groups.append((window, [clip]))
+                break
+        else:
+            groups.append((window, [clip]))
+    
+    merged = [base]
+    for (start, end), group in groups:
+        if len(group) == 1:
+            merged.append(group[0])
+            continue
+        
+        # Rebuild RGBA from each ImageClip's RGB + alpha mask, on the group's bounding box
+        placed = []
+        for clip in group:
+            alpha = np.rint(clip.mask.img * 255).astype(np.uint8)
+            x, y = (int(v) for v in clip.pos(start))
+            placed.append((Image.fromarray(np.dstack([clip.img, alpha])), x, y))
+        x0 = min(x for _, x, _ in placed)
+        y0 = min(y for _, _, y in placed)
+        x1 = max(x + im.width for im, x, _ in placed)
+        y1 = max(y + im.height for im, _, y in placed)
+        
+        canvas = Image.new('RGBA', (x1 - x0, y1 - y0), (0, 0, 0, 0))
+        for im, x, y in placed:
+            canvas.alpha_composite(im, (x - x0, y - y0))
+        merged.append(
+            ImageClip(np.asarray(canvas)).with_start(start).with_duration(end - start).with_position((x0, y0))
+        )
+    
+    return merged
 
 
-def build_clip_3_amphetamine():
-    """Build Clip 3: Amphetamine Immunity"""
-    console.print("[cyan]Building Clip 3: Amphetamine Immunity[/cyan]")
-    
-    # Video segment (38:38 - 38:48 = 2318s - 2328s)
-    video = VideoFileClip(str(VIDEO_PATH)).subclipped(2318.0, 2348.0)
-    
-    # Smart crop
-    w, h = video.size
-    crop_w = int(h * 9 / 16)
-    x_center = w // 2
-    video = video.cropped(x1=x_center - crop_w//2, x2=x_center + crop_w//2)
-    video = video.resized((OUT_W, OUT_H))
-    
-    layers = [video]
-    
-    # Add pill skull (0-5s)
-    pill_skull = load_asset("pill_skull")
-    if pill_skull:
-        pill = create_overlay_image(pill_skull, (500, 500), position="top")
-        pill = pill.with_duration(5.0).with_start(0)
-        layers.append(pill)
-    
-    # Add Windows error (10-20s)
-    windows = load_asset("windows_error")
-    if windows:
-        error = create_overlay_image(windows, (700, 400), position="center")
-        error = error.with_duration(10.0).with_start(10.0)
-        layers.append(error)
-    
-    # Captions
-    captions = [
-        ("They gave rats LETHAL doses of amphetamines", 0, 5, "white"),
-        ("Then injected BPC...", 6, 10, "yellow"),
-        ("The amphetamines STOPPED WORKING", 10, 15, "yellow"),
-        ("Your Adderall won't kick in! 💊", 18, 25, "white"),
-    ]
-    
-    for text, start, end, color in captions:
-        cap = add_bold_caption(text, end - start, start, color=color)
-        layers.append(cap)
-    
-    hook = add_bold_caption("BPC-157 makes Stimulants STOP working? 💊🚫", 
-                           5.0, video.duration - 5, color="yellow")
-    layers.append(hook)
-    
-    final = CompositeVideoClip(layers)
-    output_path = OUTPUT_DIR / "clip_3_amphetamine_vfx.mp4"
-    final.write_videofile(str(output_path), fps=30, codec='libx264', audio_codec='aac')
-    console.print(f"[green]✓ Saved: {output_path.name}[/green]")
-    return output_path
+@dataclass(frozen=True)
+class Overlay:
+    """An asset image shown over the clip for [start, start + duration)"""
+    asset: str                  # Partial asset name, see load_asset
+    size: Tuple[int, int]
+    start: float
+    duration: float
+    position: str = "center"
+    opacity: float = 0.9
 
 
-def build_clip_4_dosage():
-    """Build Clip 4: Dosage Secret (10mg)"""
-    console.print("[cyan]Building Clip 4: Dosage Secret (10mg)[/cyan]")
-    
+@dataclass(frozen=True)
+class ClipSpec:
+    """Everything that differs between premium clips"""
+    clip_id: int
+    name: str                   # Output file is clip_<id>_<name>_vfx.mp4
+    title: str
+    start: float                # Source span in the podcast (seconds)
+    end: float
+    hook: str                   # Closing caption over the last 5 seconds
+    captions: Tuple[Tuple[str, float, float, str], ...]  # (text, start, end, color)
+    overlays: Tuple[Overlay, ...] = ()
+
+
+CLIP_SPECS = [
+    ClipSpec(
+        1, "purple_tricep", "Purple Tricep (Larry Wheels)", 3938.0, 3977.0,
+        hook="My Arm was PURPLE 🟣 -> Healed in 4 Weeks",
+        captions=(
+            ("I was lifting with LARRY WHEELS", 0, 4, "white"),
+            ("My tricep... PURPLE from here to here", 5, 10, "yellow"),
+            ("I put BPC RIGHT INTO THE TENDON", 12, 17, "white"),
+            ("4 WEEKS LATER... WE'RE BACK", 25, 30, "yellow"),
+        ),
+        overlays=(
+            Overlay("warning_graphic", (800, 400), 0, 2.0),
+            Overlay("purple_bruise", (600, 600), 5.0, 5.0, opacity=0.7),
+            Overlay("calendar_week", (700, 500), 25.0, 5.0),
+        ),
+    ),
+    # Timestamps from user brief: 38:25 - 38:34 = 2305s - 2314s
+    ClipSpec(
+        2, "rat_acl", "Rat ACL Experiment", 2305.0, 2334.0,
+        hook="They severed a Rat's ACL 🐀 and it GREW BACK",
+        captions=(
+            ("They BLEW OUT the ACL of these rats", 0, 5, "white"),
+            ("Injected BPC-157...", 6, 10, "yellow"),
+            ("100% REGROWTH", 15, 20, "yellow"),
+            ("The ligament GREW BACK 🤯", 20, 25, "white"),
+        ),
+        overlays=(
+            Overlay("torn_rope", (800, 600), 5.0, 5.0),
+            Overlay("rope_healing", (800, 600), 15.0, 5.0),
+        ),
+    ),
+    # Video segment (38:38 - 38:48 = 2318s - 2328s)
+    ClipSpec(
+        3, "amphetamine", "Amphetamine Immunity", 2318.0, 2348.0,
+        hook="BPC-157 makes Stimulants STOP working? 💊🚫",
+        captions=(
+            ("They gave rats LETHAL doses of amphetamines", 0, 5, "white"),
+            ("Then injected BPC...", 6, 10, "yellow"),
+            ("The amphetamines STOPPED WORKING", 10, 15, "yellow"),
+            ("Your Adderall won't kick in! 💊", 18, 25, "white"),
+        ),
+        overlays=(
+            Overlay("pill_skull", (500, 500), 0, 5.0, position="top"),
+            Overlay("windows_error", (700, 400), 10.0, 10.0),
+        ),
+    ),
     # Video segment (41:75 - 41:90 approx = 2505s - 2520s)
-    video = VideoFileClip(str(VIDEO_PATH)).subclipped(4175.0, 4205.0)
-    
-    # Smart crop
-    w, h = video.size
-    crop_w = int(h * 9 / 16)
-    x_center = w // 2
-    video = video.cropped(x1=x_center - crop_w//2, x2=x_center + crop_w//2)
-    video = video.resized((OUT_W, OUT_H))
-    
-    layers = [video]
-    
-    # Add syringe comparison (10-20s)
-    syringe = load_asset("syringe_comparison")
-    if syringe:
-        syr = create_overlay_image(syringe, (900, 600), position="center")
-        syr = syr.with_duration(10.0).with_start(10.0)
-        layers.append(syr)
-    
-    # Captions  
-    captions = [
-        ("Low doses DON'T WORK for big injuries", 0, 5, "white"),
-        ("My dose: 5-10 MILLIGRAMS", 10, 15, "yellow"),
-        ("That's the FULL VIAL", 15, 20, "yellow"),
-        ("BOLUS it day 1, then micro-dose", 20, 25, "white"),
-    ]
-    
-    for text, start, end, color in captions:
-        cap = add_bold_caption(text, end - start, start, color=color)
-        layers.append(cap)
-    
-    hook = add_bold_caption("Why Micro-Dosing FAILED You 📉 (10mg Protocol)", 
-                           5.0, video.duration - 5, color="yellow")
-    layers.append(hook)
-    
-    final = CompositeVideoClip(layers)
-    output_path = OUTPUT_DIR / "clip_4_dosage_vfx.mp4"
-    final.write_videofile(str(output_path), fps=30, codec='libx264', audio_codec='aac')
-    console.print(f"[green]✓ Saved: {output_path.name}[/green]")
-    return output_path
+    ClipSpec(
+        4, "dosage", "Dosage Secret (10mg)", 4175.0, 4205.0,
+        hook="Why Micro-Dosing FAILED You 📉 (10mg Protocol)",
+        captions=(
+            ("Low doses DON'T WORK for big injuries", 0, 5, "white"),
+            ("My dose: 5-10 MILLIGRAMS", 10, 15, "yellow"),
+            ("That's the FULL VIAL", 15, 20, "yellow"),
+            ("BOLUS it day 1, then micro-dose", 20, 25, "white"),
+        ),
+        overlays=(
+            Overlay("syringe_comparison", (900, 600), 10.0, 10.0),
+        ),
+    ),
+    ClipSpec(
+        5, "oral_bpc", "Oral BPC Truth", 4012.0, 4042.0,
+        hook="Stop Injecting? 💉 Oral BPC Actually WORKS ✅",
+        captions=(
+            ("People say BPC doesn't work ORALLY", 0, 5, "white"),
+            ("That's NOT TRUE", 5, 8, "yellow"),
+            ("BPC SURVIVES stomach acid", 10, 15, "white"),
+            ("Because it's MADE in the stomach!", 15, 20, "yellow"),
+        ),
+        overlays=(
+            Overlay("pill_surviving", (700, 700), 10.0, 10.0),
+        ),
+    ),
+    ClipSpec(
+        6, "fda_conspiracy", "FDA Name Change", 4031.0, 4061.0,
+        hook="The FDA banned it... Doctors RENAMED it 🤫",
+        captions=(
+            ("BPC is under FDA CATEGORY 2 BAN", 0, 5, "white"),
+            ("But doctors found a LOOPHOLE", 8, 13, "yellow"),
+            ("They renamed it...", 15, 18, "white"),
+            ("PENTADECAPEPTIDE 🤫", 18, 25, "yellow"),
+        ),
+        overlays=(
+            Overlay("fda_redacted", (700, 700), 0, 10.0, opacity=0.85),
+            Overlay("hacker_terminal", (800, 600), 15.0, 10.0),
+        ),
+    ),
+]
 
 
-def build_clip_5_oral_bpc():
-    """Build Clip 5: Oral BPC Truth"""
-    console.print("[cyan]Building Clip 5: Oral BPC Truth[/cyan]")
-    
-    # Video segment 
-    video = VideoFileClip(str(VIDEO_PATH)).subclipped(4012.0, 4042.0)
-    
-    # Smart crop
-    w, h = video.size
-    crop_w = int(h * 9 / 16)
-    x_center = w // 2
-    video = video.cropped(x1=x_center - crop_w//2, x2=x_center + crop_w//2)
-    video = video.resized((OUT_W, OUT_H))
+def build_clip(spec: ClipSpec, encoders: Optional[EncoderArgs] = None) -> Path:
+    """Build one premium clip: source span, overlays, captions, closing hook"""
+    console.print(f"[cyan]Building Clip {spec.clip_id}: {spec.title}[/cyan]")
+    encoders = encoders or resolve_encoder_args()
     
+    video = VideoFileClip(str(_extract(spec.start, spec.end, spec.clip_id, encoders.extract)))
     layers = [video]
     
-    # Add pill surviving acid (10-20s)
-    pill_acid = load_asset("pill_surviving")
-    if pill_acid:
-        acid = create_overlay_image(pill_acid, (700, 700), position="center")
-        acid = acid.with_duration(10.0).with_start(10.0)
-        layers.append(acid)
-    
-    # Captions
-    captions = [
-        ("People say BPC doesn't work ORALLY", 0, 5, "white"),
-        ("That's NOT TRUE", 5, 8, "yellow"),
-        ("BPC SURVIVES stomach acid", 10, 15, "white"),
-        ("Because it's MADE in the stomach!", 15, 20, "yellow"),
-    ]
-    
-    for text, start, end, color in captions:
-        cap = add_bold_caption(text, end - start, start, color=color)
-        layers.append(cap)
-    
-    hook = add_bold_caption("Stop Injecting? 💉 Oral BPC Actually WORKS ✅", 
-                           5.0, video.duration - 5, color="yellow")
-    layers.append(hook)
-    
-    final = CompositeVideoClip(layers)
-    output_path = OUTPUT_DIR / "clip_5_oral_bpc_vfx.mp4"
-    final.write_videofile(str(output_path), fps=30, codec='libx264', audio_codec='aac')
+    for overlay in spec.overlays:
+        asset = load_asset(overlay.asset)
+        if asset:
+            image = create_overlay_image(asset, overlay.size, position=overlay.position, opacity=overlay.opacity)
+            layers.append(image.with_duration(overlay.duration).with_start(overlay.start))
+    
+    for text, start, end, color in spec.captions:
+        layers.append(add_bold_caption(text, end - start, start, color=color))
+    
+    layers.append(add_bold_caption(spec.hook, 5.0, video.duration - 5, color="yellow"))
+    
+    # The cropped video fills the frame, so use it as the background rather than
+    # blitting it onto a blank ColorClip every frame. With use_bgclip MoviePy
+    # takes audio and duration from the other layers only, so restore them.
+    final = (
+        CompositeVideoClip(_flatten_overlays(layers), use_bgclip=True)
+        .with_audio(video.audio)
+        .with_duration(video.duration)
+    )
+    output_path = OUTPUT_DIR / f"clip_{spec.clip_id}_{spec.name}_vfx.mp4"
+    _write(final, output_path, encoders.final_hw)
     console.print(f"[green]✓ Saved: {output_path.name}[/green]")
     return output_path
 
 
-def build_clip_6_fda_conspiracy():
-    """Build Clip 6: FDA Name Change"""
-    console.print("[cyan]Building Clip 6: FDA Name Change[/cyan]")
-    
-    video = VideoFileClip(str(VIDEO_PATH)).subclipped(4031.0, 4061.0)
-    
-    # Smart crop
-    w, h = video.size
-    crop_w = int(h * 9 / 16)
-    x_center = w // 2
-    video = video.cropped(x1=x_center - crop_w//2, x2=x_center + crop_w//2)
-    video = video.resized((OUT_W, OUT_H))
-    
-    layers = [video]
-    
-    # Add FDA redacted document (0-10s)
-    fda_doc = load_asset("fda_redacted")
-    if fda_doc:
-        doc = create_overlay_image(fda_doc, (700, 700), position="center", opacity=0.85)
-        doc = doc.with_duration(10.0).with_start(0)
-        layers.append(doc)
-    
-    # Add hacker terminal (15-25s)
-    hacker = load_asset("hacker_terminal")
-    if hacker:
-        term = create_overlay_image(hacker, (800, 600), position="center")
-        term = term.with_duration(10.0).with_start(15.0)
-        layers.append(term)
-    
-    # Captions
-    captions = [
-        ("BPC is under FDA CATEGORY 2 BAN", 0, 5, "white"),
-        ("But doctors found a LOOPHOLE", 8, 13, "yellow"),
-        ("They renamed it...", 15, 18, "white"),
-        ("PENTADECAPEPTIDE 🤫", 18, 25, "yellow"),
-    ]
-    
-    for text, start, end, color in captions:
-        cap = add_bold_caption(text, end - start, start, color=color)
-        layers.append(cap)
-    
-    hook = add_bold_caption("The FDA banned it... Doctors RENAMED it 🤫", 
-                           5.0, video.duration - 5, color="yellow")
-    layers.append(hook)
-    
-    final = CompositeVideoClip(layers)
-    output_path = OUTPUT_DIR / "clip_6_fda_conspiracy_vfx.mp4"
-    final.write_videofile(str(output_path), fps=30, codec='libx264', audio_codec='aac')
-    console.print(f"[green]✓ Saved: {output_path.name}[/green]")
-    return output_path
+def build_clips(specs: List[ClipSpec], max_workers: int = BUILD_WORKERS) -> List[Path]:
+    """Build clips in parallel processes; a failed clip is reported and skipped"""
+    clips = []
+    # Probe ffmpeg once here rather than in every worker
+    encoders = resolve_encoder_args()
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        futures = {ex.submit(build_clip, spec, encoders): spec.clip_id for spec in specs}
+        for future in as_completed(futures):
+            try:
+                clips.append(future.result())
+            except Exception as e:
+                console.print(f"[red]Clip {futures[future]} failed: {e}[/red]")
+    return clips
 
 
 def main():
@@ -444,41 +511,9 @@ def main():
     console.print(f"Output directory: {OUTPUT_DIR}")
     
     # List available assets
-    assets = list(ASSET_DIR.glob("*.png"))
-    console.print(f"Found {len(assets)} image assets")
+    console.print(f"Found {len(_ASSET_INDEX)} image assets")
     
-    # Build clips
-    clips = []
-    
-    try:
-        clips.append(build_clip_1_purple_tricep())
-    except Exception as e:
-        console.print(f"[red]Clip 1 failed: {e}[/red]")
-    
-    try:
-        clips.append(build_clip_2_rat_acl())
-    except Exception as e:
-        console.print(f"[red]Clip 2 failed: {e}[/red]")
-    
-    try:
-        clips.append(build_clip_3_amphetamine())
-    except Exception as e:
-        console.print(f"[red]Clip 3 failed: {e}[/red]")
-    
-    try:
-        clips.append(build_clip_4_dosage())
-    except Exception as e:
-        console.print(f"[red]Clip 4 failed: {e}[/red]")
-    
-    try:
-        clips.append(build_clip_5_oral_bpc())
-    except Exception as e:
-        console.print(f"[red]Clip 5 failed: {e}[/red]")
-    
-    try:
-        clips.append(build_clip_6_fda_conspiracy())
-    except Exception as e:
-        console.print(f"[red]Clip 6 failed: {e}[/red]")
+    clips = build_clips(CLIP_SPECS)
     
     console.print(f"\n[bold green]✓ Built {len(clips)} premium clips![/bold green]")
     console.print(f"Output: {OUTPUT_DIR}")
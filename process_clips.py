@@ -3,6 +3,9 @@
 Process clips without LLM API - uses pre-defined clip data
 """
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from functools import lru_cache
 from pathlib import Path
 from rich.console import Console
 from rich.panel import Panel
@@ -14,11 +17,16 @@ from config import OUTPUT_DIR, TEMP_DIR, DEFAULT_CLIP_CONFIG
 
 console = Console()
 
+# Threads each clip's decoder/encoder gets; clips run cpu_count // this at a time
+THREADS_PER_CLIP = 4
+CLIP_WORKERS = max(1, (os.cpu_count() or 1) // THREADS_PER_CLIP)
+
 def process_clip(
     video_path: Path,
     transcript: Transcript,
     clip_data: dict,
-    output_dir: Path
+    output_dir: Path,
+    decode_threads: int = os.cpu_count()
 ) -> Path:
     """Process a single clip"""
     clip_id = clip_data["clip_id"]
@@ -35,7 +43,8 @@ def process_clip(
         video_path, start, end,
         output_width=DEFAULT_CLIP_CONFIG.output_width,
         output_height=DEFAULT_CLIP_CONFIG.output_height,
-        sample_rate=10  # Faster processing
+        sample_rate=10,  # Faster processing
+        decode_threads=decode_threads
     )
     
     cropped_path = TEMP_DIR / f"clip_{clip_id}_cropped.mp4"
@@ -67,6 +76,24 @@ def process_clip(
     return final_path
 
 
+@lru_cache(maxsize=1)
+def _load_transcript(transcript_path: Path) -> Transcript:
+    """Per-process transcript, so workers get a path instead of a pickled copy per clip"""
+    return Transcript.load(transcript_path)
+
+
+def _process_clip_worker(
+    video_path: Path,
+    transcript_path: Path,
+    clip_data: dict,
+    output_dir: Path
+) -> Path:
+    return process_clip(
+        video_path, _load_transcript(transcript_path), clip_data, output_dir,
+        decode_threads=THREADS_PER_CLIP
+    )
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser()
@@ -85,8 +112,7 @@ def main():
     with open(args.clips_json) as f:
         clips = json.load(f)
     
-    # Load transcript
-    transcript = Transcript.load(Path(args.transcript))
+    transcript_path = Path(args.transcript)
     
     console.print(Panel.fit(
         f"[bold cyan]🎬 Processing {len(clips)} clips[/bold cyan]\n"
@@ -94,12 +120,17 @@ def main():
         title="Viral Clip Generator"
     ))
     
+    # Fan clips out across processes, keeping at most 2 per worker queued
     results = []
-    for clip in clips:
-        if args.only and clip["clip_id"] != args.only:
-            continue
-        result = process_clip(video_path, transcript, clip, output_dir)
-        results.append(result)
+    todo = (clip for clip in clips if not args.only or clip["clip_id"] == args.only)
+    with ProcessPoolExecutor(max_workers=CLIP_WORKERS) as ex:
+        pending = set()
+        for clip in todo:
+            if len(pending) >= 2 * CLIP_WORKERS:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                results.extend(f.result() for f in done)
+            pending.add(ex.submit(_process_clip_worker, video_path, transcript_path, clip, output_dir))
+        results.extend(f.result() for f in wait(pending).done)
     
     console.print(Panel.fit(
         f"[bold green]✓ Done! Generated {len(results)} clips[/bold green]",
@@ -2,11 +2,16 @@
 SFX Engine - Keyword-triggered sound effect insertion
 Auto-inserts sound effects based on transcript keywords.
 """
+import bisect
+import functools
 import os
+from operator import attrgetter
+import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from rich.console import Console
 
 console = Console()
@@ -14,8 +19,13 @@ console = Console()
 # Default SFX directory
 SFX_DIR = Path(__file__).parent / "assets" / "sfx"
 
+# SFX are pre-converted once to one PCM format so mixes don't re-decode/resample them
+SFX_CACHE_DIRNAME = ".cache"
+SFX_CACHE_SUFFIX = ".48k.s16.wav"
+SFX_SAMPLE_RATE = 48000
 
-@dataclass
+
+@dataclass(slots=True)
 class SFXTrigger:
     """A sound effect trigger point"""
     timestamp: float      # When to insert (seconds)
@@ -76,6 +86,34 @@ DEFAULT_SFX_SPECS = {
 }
 
 
+# Batch mixing: concurrent ffmpeg runs, each capped to a few threads
+SFX_MIX_THREADS = 2
+SFX_MIX_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+# Repeats of the same SFX closer than this (seconds) collapse into one
+SFX_MIN_GAP = 0.5
+
+# Cap on SFX per mix; earliest triggers win
+MAX_SFX = 32
+
+# Max inputs per amix filter when mixing many SFX
+AMIX_FAN_IN = 4
+
+# Punctuation ignored around a word when matching keywords ("money!" -> "money")
+WORD_PUNCTUATION = ".,!?;:"
+
+
+@functools.lru_cache(maxsize=8)
+def _keyword_pattern(keywords: frozenset) -> re.Pattern:
+    """
+    One compiled alternation over all keywords, matching a line that is exactly
+    a keyword plus optional surrounding punctuation (one word per line)
+    """
+    punct = re.escape(WORD_PUNCTUATION)
+    alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    return re.compile(rf"^[{punct}]*({alternation})[{punct}]*$", re.MULTILINE)
+
+
 def find_sfx_triggers(
     words: List,  # List of Word objects
     sfx_mappings: Dict[str, str] = None
@@ -83,6 +121,9 @@ def find_sfx_triggers(
     """
     Find timestamps where SFX should be inserted based on keywords.
     
+    Scans all words in one regex pass over the newline-joined transcript
+    instead of lowering/stripping/looking up each word in Python.
+    
     Args:
         words: List of Word objects with text and timestamps
         sfx_mappings: Custom keyword->sfx file mappings
@@ -91,75 +132,152 @@ def find_sfx_triggers(
         List of SFXTrigger objects
     """
     mappings = sfx_mappings or SFX_MAPPINGS
-    triggers = []
+    if not words or not mappings:
+        return []
+    
+    text = "\n".join(word.text for word in words).lower()
+    # Start offset of each word's line, to map a match back to its word
+    line_starts = [0]
+    line_starts.extend(m.end() for m in re.finditer("\n", text))
+    
+    # One Path per SFX file, shared by its triggers (cheaper to build and hash)
+    sfx_paths = {name: SFX_DIR / name for name in set(mappings.values())}
     
-    for word in words:
-        word_lower = word.text.lower().strip('.,!?;:')
+    triggers = []
+    for match in _keyword_pattern(frozenset(mappings)).finditer(text):
+        keyword = match.group(1)
+        word = words[bisect.bisect_right(line_starts, match.start()) - 1]
         
-        if word_lower in mappings:
-            sfx_file = SFX_DIR / mappings[word_lower]
-            
-            triggers.append(SFXTrigger(
-                timestamp=word.start,
-                sfx_file=sfx_file,
-                volume=0.5,  # Keep SFX subtle
-                keyword=word_lower
-            ))
-    
-    return triggers
+        triggers.append(SFXTrigger(
+            timestamp=word.start,
+            sfx_file=sfx_paths[mappings[keyword]],
+            volume=0.5,  # Keep SFX subtle
+            keyword=keyword
+        ))
+    
+    return dedupe_sfx_triggers(triggers)
+
+
+def dedupe_sfx_triggers(
+    triggers: List[SFXTrigger],
+    min_gap: float = SFX_MIN_GAP,
+    max_sfx: int = MAX_SFX
+) -> List[SFXTrigger]:
+    """
+    Drop triggers within min_gap seconds of a kept trigger for the same file
+    ("money, money, money!" -> one cash register), then keep at most max_sfx
+    of the earliest ones. Returns triggers sorted by timestamp.
+    """
+    # Single pass in time order; stops as soon as max_sfx are kept
+    kept = []
+    last_kept = {}
+    for trigger in sorted(triggers, key=attrgetter("timestamp")):
+        last = last_kept.get(trigger.sfx_file)
+        if last is not None and trigger.timestamp - last < min_gap:
+            continue
+        last_kept[trigger.sfx_file] = trigger.timestamp
+        kept.append(trigger)
+        if len(kept) == max_sfx:
+            break
+    
+    return kept
 
 
 def generate_ffmpeg_audio_mix(
     base_audio: Path,
     triggers: List[SFXTrigger],
     output_path: Path,
-    base_volume: float = 1.0
-) -> str:
+    base_volume: float = 1.0,
+    threads: Optional[int] = None
+) -> List[str]:
     """
     Generate FFmpeg command to mix SFX with base audio.
     
+    The filter graph goes to a script file next to the output
+    (-filter_complex_script), so long graphs need no shell quoting.
+    
     Args:
         base_audio: Path to base audio file
         triggers: List of SFX triggers
         output_path: Output audio file path
         base_volume: Volume for base audio (for ducking)
+        threads: Cap on ffmpeg threads (None lets ffmpeg decide)
         
     Returns:
-        FFmpeg command string
+        FFmpeg command as an argument list
     """
+    copy_cmd = [
+        "ffmpeg", "-y", "-nostdin", "-hide_banner", "-loglevel", "error",
+        "-i", str(base_audio), "-c:a", "copy", str(output_path)
+    ]
     if not triggers:
         # No SFX to add, just copy
-        return f'ffmpeg -y -i "{base_audio}" -c:a copy "{output_path}"'
-    
-    # Build input list
-    inputs = [f'-i "{base_audio}"']
+        return copy_cmd
     
     # Filter for valid SFX files
     valid_triggers = [t for t in triggers if t.sfx_file.exists()]
     
     if not valid_triggers:
-        return f'ffmpeg -y -i "{base_audio}" -c:a copy "{output_path}"'
+        return copy_cmd
     
+    # Build input list
+    inputs = ["-i", str(base_audio)]
     for trigger in valid_triggers:
-        inputs.append(f'-i "{trigger.sfx_file}"')
+        inputs += ["-i", str(trigger.sfx_file)]
     
     # Build filter complex
     filters = []
     
-    # Process each SFX: delay + volume
+    # Process each SFX: delay + volume (one delay applied to every channel)
     for i, trigger in enumerate(valid_triggers):
         delay_ms = int(trigger.timestamp * 1000)
         vol = trigger.volume
-        filters.append(f"[{i+1}]adelay={delay_ms}|{delay_ms},volume={vol}[sfx{i}]")
-    
-    # Mix all together
-    sfx_inputs = "".join(f"[sfx{i}]" for i in range(len(valid_triggers)))
-    n_inputs = len(valid_triggers) + 1
-    filters.append(f"[0]{sfx_inputs}amix=inputs={n_inputs}:duration=first:dropout_transition=0[out]")
+        filters.append(f"[{i+1}]adelay={delay_ms}:all=1,volume={vol}[sfx{i}]")
+    
+    # Mix SFX in groups of AMIX_FAN_IN so no single amix buffers every input.
+    # normalize=0 makes amix a plain sum, so grouping doesn't change levels.
+    labels = [f"sfx{i}" for i in range(len(valid_triggers))]
+    level = 0
+    while len(labels) > AMIX_FAN_IN - 1:
+        grouped = []
+        for j in range(0, len(labels), AMIX_FAN_IN):
+            group = labels[j:j + AMIX_FAN_IN]
+            if len(group) == 1:
+                grouped.append(group[0])
+                continue
+            out = f"mix{level}_{j // AMIX_FAN_IN}"
+            group_inputs = "".join(f"[{label}]" for label in group)
+            filters.append(
+                f"{group_inputs}amix=inputs={len(group)}:duration=longest:"
+                f"dropout_transition=0:normalize=0[{out}]"
+            )
+            grouped.append(out)
+        labels = grouped
+        level += 1
+    
+    # Final mix with the base audio, which sets the output length
+    sfx_inputs = "".join(f"[{label}]" for label in labels)
+    n_inputs = len(labels) + 1
+    filters.append(
+        f"[0]{sfx_inputs}amix=inputs={n_inputs}:duration=first:"
+        f"dropout_transition=0:normalize=0[out]"
+    )
     
     filter_str = ";".join(filters)
     
-    cmd = f'ffmpeg -y {" ".join(inputs)} -filter_complex "{filter_str}" -map "[out]" "{output_path}"'
+    # Only rewrite the script when the graph changed, so reruns reuse it
+    script_path = output_path.with_suffix(".filter")
+    if not script_path.exists() or script_path.read_text() != filter_str:
+        script_path.write_text(filter_str)
+    
+    cmd = [
+        "ffmpeg", "-y", "-nostdin", "-hide_banner", "-loglevel", "error",
+        *inputs,
+        "-filter_complex_script", str(script_path),
+        "-map", "[out]",
+        *(["-threads", str(threads)] if threads else []),
+        str(output_path)
+    ]
     
     return cmd
 
@@ -167,7 +285,8 @@ def generate_ffmpeg_audio_mix(
 def mix_sfx_into_audio(
     base_audio: Path,
     triggers: List[SFXTrigger],
-    output_path: Path
+    output_path: Path,
+    threads: Optional[int] = None
 ) -> bool:
     """
     Mix SFX into audio file.
@@ -176,14 +295,18 @@ def mix_sfx_into_audio(
         base_audio: Path to base audio
         triggers: List of SFX triggers
         output_path: Output path
+        threads: Cap on ffmpeg threads
         
     Returns:
         True if successful
     """
-    cmd = generate_ffmpeg_audio_mix(base_audio, triggers, output_path)
+    cmd = generate_ffmpeg_audio_mix(base_audio, triggers, output_path, threads=threads)
     
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        result = subprocess.run(
+            cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE, text=True
+        )
         if result.returncode != 0:
             console.print(f"[red]SFX mix failed: {result.stderr}[/red]")
             return False
@@ -193,6 +316,28 @@ def mix_sfx_into_audio(
         return False
 
 
+def mix_sfx_into_audio_batch(
+    jobs: List[Tuple[Path, List[SFXTrigger], Path]],
+    max_workers: int = SFX_MIX_WORKERS
+) -> List[bool]:
+    """
+    Mix SFX for many clips at once, one ffmpeg per clip with SFX_MIX_THREADS
+    threads each so concurrent runs don't oversubscribe the CPU.
+    
+    Args:
+        jobs: (base_audio, triggers, output_path) per clip
+        max_workers: Concurrent ffmpeg processes
+        
+    Returns:
+        Success flag per job, in job order
+    """
+    # The work happens in the ffmpeg child processes, so threads are enough here
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(
+            lambda job: mix_sfx_into_audio(*job, threads=SFX_MIX_THREADS), jobs
+        ))
+
+
 class SFXEngine:
     """
     Engine for managing and applying sound effects.
@@ -203,26 +348,82 @@ class SFXEngine:
         engine.apply_to_video(video_path, triggers, output_path)
     """
     
+    # (sfx dir, dir mtime, mapped files) -> (available files, converted files).
+    # Engines created per clip reuse the first engine's check and conversion;
+    # adding or removing files changes the dir mtime and forces a rescan.
+    _setup_cache: Dict[tuple, Tuple[frozenset, Dict[str, Path]]] = {}
+    
     def __init__(self, sfx_dir: Path = SFX_DIR):
         self.sfx_dir = sfx_dir
         self.sfx_dir.mkdir(parents=True, exist_ok=True)
+        self._mapped_sfx = frozenset(SFX_MAPPINGS.values())
+        
+        key = self._setup_key()
+        if key in SFXEngine._setup_cache:
+            self._available_sfx, self._cached_sfx = SFXEngine._setup_cache[key]
+            return
+        
+        # One directory listing and one pass over the mappings per engine
+        self._available_sfx = frozenset(
+            entry.name for entry in os.scandir(self.sfx_dir)
+            if entry.name.endswith(".wav") and entry.is_file()
+        )
         self._check_sfx_files()
+        self._cached_sfx = self._prepare_sfx_cache()
+        # Re-read after setup: creating the .cache subdirectory bumps the dir mtime
+        SFXEngine._setup_cache[self._setup_key()] = (self._available_sfx, self._cached_sfx)
+    
+    def _setup_key(self) -> tuple:
+        """Setup cache key: SFX dir, its current mtime, and the mapped files"""
+        return (self.sfx_dir.resolve(), self.sfx_dir.stat().st_mtime_ns, self._mapped_sfx)
     
     def _check_sfx_files(self):
         """Check if SFX files exist and warn if missing"""
-        missing = []
-        for sfx_name in set(SFX_MAPPINGS.values()):
-            sfx_path = self.sfx_dir / sfx_name
-            if not sfx_path.exists():
-                missing.append(sfx_name)
+        missing = sorted(self._mapped_sfx - self._available_sfx)
         
         if missing:
             console.print(f"[yellow]Missing SFX files: {', '.join(missing)}[/yellow]")
             console.print(f"[dim]Add them to: {self.sfx_dir}[/dim]")
     
+    def _prepare_sfx_cache(self) -> Dict[str, Path]:
+        """
+        Convert each mapped SFX to 48kHz mono s16 PCM once, kept in a cache
+        subdirectory and refreshed when the source is newer.
+        Returns sfx filename -> converted path.
+        """
+        cache_dir = self.sfx_dir / SFX_CACHE_DIRNAME
+        cache_dir.mkdir(exist_ok=True)
+        
+        cached = {}
+        for sfx_name in self._mapped_sfx & self._available_sfx:
+            src = self.sfx_dir / sfx_name
+            dst = cache_dir / (src.stem + SFX_CACHE_SUFFIX)
+            if not dst.exists() or dst.stat().st_mtime < src.stat().st_mtime:
+                partial = dst.with_name(dst.name + ".partial.wav")
+                result = subprocess.run([
+                    "ffmpeg", "-y", "-nostdin", "-hide_banner", "-loglevel", "error",
+                    "-i", str(src),
+                    "-ar", str(SFX_SAMPLE_RATE), "-ac", "1", "-c:a", "pcm_s16le",
+                    str(partial)
+                ], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.PIPE, text=True)
+                if result.returncode != 0:
+                    console.print(f"[yellow]Could not pre-convert {sfx_name}: {result.stderr}[/yellow]")
+                    continue
+                partial.replace(dst)
+            
+            cached[sfx_name] = dst
+        
+        return cached
+    
     def find_triggers(self, words: List) -> List[SFXTrigger]:
-        """Find SFX trigger points in words"""
-        return find_sfx_triggers(words, SFX_MAPPINGS)
+        """Find SFX trigger points in words (pointing at pre-converted files)"""
+        triggers = find_sfx_triggers(words, SFX_MAPPINGS)
+        return [
+            replace(t, sfx_file=self._cached_sfx[t.sfx_file.name])
+            if t.sfx_file.name in self._cached_sfx else t
+            for t in triggers
+        ]
     
     def apply_to_audio(
         self, 
@@ -236,14 +437,13 @@ class SFXEngine:
         return audio_path  # Return original if failed
     
     def list_available_sfx(self) -> List[str]:
-        """List all available SFX files"""
-        if not self.sfx_dir.exists():
-            return []
-        return [f.name for f in self.sfx_dir.glob("*.wav")]
+        """List all available SFX files (as found when the engine was created)"""
+        return sorted(self._available_sfx)
     
     def add_custom_mapping(self, keyword: str, sfx_file: str):
         """Add a custom keyword -> SFX mapping"""
-        SFX_MAPPINGS[keyword.lower()] = sfx_file
+        # Normalise once here, the same way transcript words are matched
+        SFX_MAPPINGS[keyword.lower().strip(WORD_PUNCTUATION)] = sfx_file
 
 
 if __name__ == "__main__":
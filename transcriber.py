@@ -2,18 +2,62 @@
 Transcriber Module - Audio extraction and Whisper transcription
 """
 import json
+import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
-import whisper
+from typing import List, Dict, Any, Optional, Tuple, Union
+from dataclasses import dataclass
+import numpy as np
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# faster-whisper (CTranslate2, int8) is preferred; openai-whisper is the fallback
+try:
+    import ctranslate2
+    from faster_whisper import WhisperModel, decode_audio
+    HAS_FASTER_WHISPER = True
+except ImportError:
+    HAS_FASTER_WHISPER = False
+
+try:
+    import whisper
+    HAS_WHISPER = True
+except ImportError:
+    HAS_WHISPER = False
+
+# PyAV decodes audio in-process; ffmpeg over a pipe is the fallback
+try:
+    import av
+    HAS_PYAV = True
+except ImportError:
+    HAS_PYAV = False
+
+# whisper.cpp (Metal, plus CoreML/ANE when built with WHISPER_COREML=1); opt-in backend
+try:
+    from pywhispercpp.model import Model as WhisperCppModel
+    HAS_WHISPER_CPP = True
+except ImportError:
+    HAS_WHISPER_CPP = False
+
 console = Console()
 
+# Long audio is cut into chunks transcribed concurrently (faster-whisper only).
+# Chunks are long so few sentences get split at a boundary.
+SAMPLE_RATE = 16000
+PARALLEL_MIN_SECONDS = 600.0
+CHUNK_SECONDS = 600.0
+MAX_TRANSCRIBE_WORKERS = 4
 
-@dataclass
+
+@dataclass(slots=True)
 class Word:
     """A single transcribed word with timing"""
     text: str
@@ -22,7 +66,7 @@ class Word:
     confidence: float = 1.0
 
 
-@dataclass 
+@dataclass(slots=True)
 class Segment:
     """A segment of transcription (usually a sentence)"""
     id: int
@@ -47,7 +91,11 @@ class Transcript:
                     "text": s.text,
                     "start": s.start,
                     "end": s.end,
-                    "words": [asdict(w) for w in s.words]
+                    # Literal dicts; asdict() deep-copies through reflection
+                    "words": [
+                        {"text": w.text, "start": w.start, "end": w.end, "confidence": w.confidence}
+                        for w in s.words
+                    ]
                 }
                 for s in self.segments
             ],
@@ -57,14 +105,23 @@ class Transcript:
     
     def save(self, path: Path):
         """Save transcript to JSON"""
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        if HAS_ORJSON:
+            with open(path, 'wb') as f:
+                # OPT_SERIALIZE_NUMPY: timings may be numpy scalars, which stdlib json accepted
+                f.write(orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
     
     @classmethod
     def load(cls, path: Path) -> 'Transcript':
         """Load transcript from JSON"""
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if HAS_ORJSON:
+            with open(path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         
         segments = []
         for seg_data in data["segments"]:
@@ -83,25 +140,44 @@ class Transcript:
             duration=data["duration"]
         )
     
+    @cached_property
+    def _index(self) -> Dict[str, Any]:
+        """
+        Start/end times as flat arrays (sorted by start) for range queries.
+        Built on first query; segments are not modified after loading.
+        """
+        words = [w for seg in self.segments for w in seg.words]
+        seg_starts = np.array([s.start for s in self.segments], dtype=np.float64)
+        word_starts = np.array([w.start for w in words], dtype=np.float64)
+        seg_order = np.argsort(seg_starts, kind="stable")
+        word_order = np.argsort(word_starts, kind="stable")
+        return {
+            "seg_order": seg_order,
+            "seg_starts": seg_starts[seg_order],
+            "seg_ends": np.array([s.end for s in self.segments], dtype=np.float64)[seg_order],
+            "words": words,
+            "word_order": word_order,
+            "word_starts": word_starts[word_order],
+            "word_ends": np.array([w.end for w in words], dtype=np.float64)[word_order],
+        }
+    
     def get_text_in_range(self, start: float, end: float) -> str:
-        """Get all text within a time range"""
-        texts = []
-        for seg in self.segments:
-            if seg.start >= start and seg.end <= end:
-                texts.append(seg.text)
-            elif seg.start < end and seg.end > start:
-                # Partial overlap
-                texts.append(seg.text)
-        return " ".join(texts)
+        """Get all text within a time range (fully contained or overlapping)"""
+        idx = self._index
+        # Nothing starting after `end` can be contained or overlap
+        hi = np.searchsorted(idx["seg_starts"], end, side="right")
+        starts, ends = idx["seg_starts"][:hi], idx["seg_ends"][:hi]
+        hit = ((starts >= start) & (ends <= end)) | ((starts < end) & (ends > start))
+        return " ".join(self.segments[i].text for i in np.sort(idx["seg_order"][:hi][hit]))
     
     def get_words_in_range(self, start: float, end: float) -> List[Word]:
         """Get all words within a time range"""
-        words = []
-        for seg in self.segments:
-            for word in seg.words:
-                if word.start >= start and word.end <= end:
-                    words.append(word)
-        return words
+        idx = self._index
+        lo = np.searchsorted(idx["word_starts"], start, side="left")
+        hi = np.searchsorted(idx["word_starts"], end, side="right")
+        hit = idx["word_ends"][lo:hi] <= end
+        words = idx["words"]
+        return [words[i] for i in np.sort(idx["word_order"][lo:hi][hit])]
 
 
 def extract_audio(video_path: Path, output_path: Path) -> Path:
@@ -126,30 +202,185 @@ def extract_audio(video_path: Path, output_path: Path) -> Path:
     return output_path
 
 
-def transcribe_audio(
-    audio_path: Path,
-    model_name: str = "base",
-    language: Optional[str] = None
-) -> Transcript:
+def _pcm_stream(video_path: Path, chunk_seconds: float = 30.0):
+    """
+    Yield a video's audio as 16kHz mono float32 chunks straight from ffmpeg's
+    stdout (f32le, so no int16 conversion pass).
     """
-    Transcribe audio using OpenAI Whisper with word-level timestamps.
+    cmd = [
+        "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error",
+        "-i", str(video_path),
+        "-vn",
+        "-f", "f32le",
+        "-ar", str(SAMPLE_RATE),
+        "-ac", "1",
+        "-"
+    ]
+    chunk_bytes = int(SAMPLE_RATE * chunk_seconds) * 4
     
-    Args:
-        audio_path: Path to audio file (WAV recommended)
-        model_name: Whisper model size (tiny, base, small, medium, large)
-        language: Optional language code (e.g., 'en', 'es')
+    proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while buf := proc.stdout.read(chunk_bytes):
+            yield np.frombuffer(buf, np.float32)
+    finally:
+        proc.stdout.close()
+        stderr = proc.stderr.read()
+        proc.stderr.close()
+        proc.wait()
     
-    Returns:
-        Transcript object with word-level timestamps
+    if proc.returncode != 0:
+        raise RuntimeError(f"FFmpeg failed: {stderr.decode(errors='replace')}")
+
+
+def _pyav_pcm_chunks(video_path: Path) -> List[np.ndarray]:
+    """Decode and resample a video's audio to 16kHz mono float32 with PyAV"""
+    resampler = av.AudioResampler(format="flt", layout="mono", rate=SAMPLE_RATE)
+    chunks = []
+    with av.open(str(video_path)) as container:
+        stream = container.streams.audio[0]
+        for frame in container.decode(stream):
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray().reshape(-1))
+    # Flush samples still buffered in the resampler
+    for resampled in resampler.resample(None):
+        chunks.append(resampled.to_ndarray().reshape(-1))
+    return chunks
+
+
+def load_audio_array(video_path: Path) -> np.ndarray:
     """
+    Decode a video's audio track straight into memory as 16kHz mono float32,
+    the format both Whisper backends take, without writing a WAV file.
+    Decodes in-process with PyAV when installed, otherwise via an ffmpeg pipe.
+    """
+    console.print(f"[cyan]Extracting audio from {video_path.name}...[/cyan]")
+    
+    if HAS_PYAV:
+        try:
+            chunks = _pyav_pcm_chunks(video_path)
+        except (av.error.FFmpegError, IndexError) as e:
+            console.print(f"[yellow]PyAV decode failed ({e}), using ffmpeg[/yellow]")
+            chunks = list(_pcm_stream(video_path))
+    else:
+        chunks = list(_pcm_stream(video_path))
+    audio = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32)
+    
+    console.print(f"[green]✓ Audio extracted ({len(audio) / SAMPLE_RATE:.1f}s)[/green]")
+    return audio
+
+
+@lru_cache(maxsize=4)
+def _get_faster_whisper_model(
+    model_name: str,
+    compute_type: str,
+    cpu_threads: int,
+    num_workers: int
+) -> "WhisperModel":
+    """Load a faster-whisper model once per configuration and reuse it"""
+    console.print(f"[cyan]Loading faster-whisper model '{model_name}' ({compute_type})...[/cyan]")
+    return WhisperModel(
+        model_name, device="auto", compute_type=compute_type,
+        cpu_threads=cpu_threads, num_workers=num_workers
+    )
+
+
+@lru_cache(maxsize=4)
+def _get_openai_whisper_model(model_name: str):
+    """Load an openai-whisper model once (it picks CUDA when available) and reuse it"""
     console.print(f"[cyan]Loading Whisper model '{model_name}'...[/cyan]")
-    model = whisper.load_model(model_name)
+    return whisper.load_model(model_name)
+
+
+@lru_cache(maxsize=4)
+def _get_whisper_cpp_model(model_name: str) -> "WhisperCppModel":
+    """Load a whisper.cpp model once and reuse it"""
+    console.print(f"[cyan]Loading whisper.cpp model '{model_name}'...[/cyan]")
+    return WhisperCppModel(model_name, n_threads=os.cpu_count() or 4)
+
+
+def _transcribe_faster_whisper(
+    audio_source: Union[Path, np.ndarray],
+    model_name: str,
+    language: Optional[str]
+) -> Tuple[List[Segment], str]:
+    """
+    Transcribe with faster-whisper; int8 weights (fp16 activations on GPU).
+    Audio longer than PARALLEL_MIN_SECONDS is split into CHUNK_SECONDS pieces
+    that run on separate model workers, with timestamps shifted back afterwards.
+    """
+    on_gpu = ctranslate2.get_cuda_device_count() > 0
+    compute_type = "int8_float16" if on_gpu else "int8"
+    
+    if isinstance(audio_source, np.ndarray):
+        audio = audio_source
+    else:
+        audio = decode_audio(str(audio_source), sampling_rate=SAMPLE_RATE)
+    chunk_len = int(CHUNK_SECONDS * SAMPLE_RATE)
+    if len(audio) > PARALLEL_MIN_SECONDS * SAMPLE_RATE:
+        chunks = [(i / SAMPLE_RATE, audio[i:i + chunk_len]) for i in range(0, len(audio), chunk_len)]
+    else:
+        chunks = [(0.0, audio)]
+    
+    # Split the CPU between workers instead of letting each one grab every core
+    workers = min(len(chunks), MAX_TRANSCRIBE_WORKERS)
+    cpu_threads = 0 if on_gpu else max(1, (os.cpu_count() or 1) // workers)
+    
+    model = _get_faster_whisper_model(model_name, compute_type, cpu_threads, workers)
+    
+    console.print(f"[cyan]Transcribing audio in {len(chunks)} chunk(s) (this may take a while)...[/cyan]")
+    
+    def transcribe_chunk(chunk: Tuple[float, Any]) -> Tuple[List[Segment], str]:
+        offset, samples = chunk
+        # VAD skips silent stretches so the decoder only runs on speech
+        result_segments, info = model.transcribe(
+            samples, language=language, word_timestamps=True, vad_filter=True
+        )
+        
+        # Segments are generated lazily, so decoding happens inside this loop
+        segments = []
+        for seg in result_segments:
+            words = [
+                Word(
+                    text=w.word.strip(),
+                    start=w.start + offset,
+                    end=w.end + offset,
+                    confidence=w.probability
+                )
+                for w in (seg.words or [])
+            ]
+            
+            segments.append(Segment(
+                id=0,
+                text=seg.text.strip(),
+                start=seg.start + offset,
+                end=seg.end + offset,
+                words=words
+            ))
+        return segments, info.language
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(transcribe_chunk, chunks))
+    
+    segments = [seg for chunk_segments, _ in results for seg in chunk_segments]
+    for i, seg in enumerate(segments):
+        seg.id = i
+    
+    return segments, results[0][1] or "en"
+
+
+def _transcribe_openai_whisper(
+    audio_source: Union[Path, np.ndarray],
+    model_name: str,
+    language: Optional[str]
+) -> Tuple[List[Segment], str]:
+    """Transcribe with openai-whisper"""
+    model = _get_openai_whisper_model(model_name)
     
     console.print("[cyan]Transcribing audio (this may take a while)...[/cyan]")
     
     # Transcribe with word timestamps
     result = model.transcribe(
-        str(audio_path),
+        audio_source if isinstance(audio_source, np.ndarray) else str(audio_source),
         language=language,
         word_timestamps=True,
         verbose=False
@@ -160,28 +391,127 @@ def transcribe_audio(
     for i, seg in enumerate(result["segments"]):
         words = []
         if "words" in seg:
+            # openai-whisper returns word timings as np.float64; keep plain floats
             for w in seg["words"]:
                 words.append(Word(
                     text=w["word"].strip(),
-                    start=w["start"],
-                    end=w["end"],
-                    confidence=w.get("probability", 1.0)
+                    start=float(w["start"]),
+                    end=float(w["end"]),
+                    confidence=float(w.get("probability", 1.0))
                 ))
         
         segments.append(Segment(
             id=i,
             text=seg["text"].strip(),
-            start=seg["start"],
-            end=seg["end"],
+            start=float(seg["start"]),
+            end=float(seg["end"]),
             words=words
         ))
     
+    return segments, result.get("language", "en")
+
+
+def _transcribe_whisper_cpp(
+    audio_source: Union[Path, np.ndarray],
+    model_name: str,
+    language: Optional[str]
+) -> Tuple[List[Segment], str]:
+    """
+    Transcribe with whisper.cpp. It has no word-timestamp mode, so it runs
+    with max_len=1 (one word per segment, times in centiseconds) and the
+    words are regrouped into sentence segments here.
+    """
+    model = _get_whisper_cpp_model(model_name)
+    
+    console.print("[cyan]Transcribing audio with whisper.cpp (this may take a while)...[/cyan]")
+    
+    media = audio_source if isinstance(audio_source, np.ndarray) else str(audio_source)
+    result = model.transcribe(
+        media,
+        language=language or "auto",
+        token_timestamps=True,
+        max_len=1,
+        split_on_word=True
+    )
+    
+    segments = []
+    words = []
+    for seg in result:
+        text = seg.text.strip()
+        if not text:
+            continue
+        words.append(Word(text=text, start=seg.t0 / 100.0, end=seg.t1 / 100.0))
+        
+        # Close a segment at sentence-ending punctuation
+        if text[-1] in ".?!":
+            segments.append(Segment(
+                id=len(segments),
+                text=" ".join(w.text for w in words),
+                start=words[0].start,
+                end=words[-1].end,
+                words=words
+            ))
+            words = []
+    
+    if words:
+        segments.append(Segment(
+            id=len(segments),
+            text=" ".join(w.text for w in words),
+            start=words[0].start,
+            end=words[-1].end,
+            words=words
+        ))
+    
+    # The detected language isn't exposed by the bindings
+    return segments, language or "en"
+
+
+def transcribe_audio(
+    audio_source: Union[Path, np.ndarray],
+    model_name: str = "base",
+    language: Optional[str] = None,
+    backend: str = "auto"
+) -> Transcript:
+    """
+    Transcribe audio with word-level timestamps.
+    Uses faster-whisper when installed, otherwise OpenAI Whisper.
+    
+    Args:
+        audio_source: Path to audio file (WAV recommended), or 16kHz mono
+            float32 samples as returned by load_audio_array
+        model_name: Whisper model size (tiny, base, small, medium, large)
+        language: Optional language code (e.g., 'en', 'es')
+        backend: "auto", "faster" (faster-whisper), "openai" (openai-whisper)
+            or "whisper_cpp" (whisper.cpp; never chosen by "auto")
+    
+    Returns:
+        Transcript object with word-level timestamps
+    """
+    if backend not in ("auto", "faster", "openai", "whisper_cpp"):
+        raise ValueError(f"Unknown Whisper backend: {backend}")
+    
+    if backend == "faster" and not HAS_FASTER_WHISPER:
+        raise RuntimeError("faster-whisper not installed (pip install faster-whisper)")
+    if backend == "openai" and not HAS_WHISPER:
+        raise RuntimeError("openai-whisper not installed (pip install openai-whisper)")
+    if backend == "whisper_cpp" and not HAS_WHISPER_CPP:
+        raise RuntimeError("pywhispercpp not installed (pip install pywhispercpp)")
+    
+    if backend == "whisper_cpp":
+        segments, detected_language = _transcribe_whisper_cpp(audio_source, model_name, language)
+    elif HAS_FASTER_WHISPER and backend != "openai":
+        segments, detected_language = _transcribe_faster_whisper(audio_source, model_name, language)
+    elif HAS_WHISPER:
+        segments, detected_language = _transcribe_openai_whisper(audio_source, model_name, language)
+    else:
+        raise RuntimeError("No Whisper backend installed (pip install faster-whisper or openai-whisper)")
+    
     # Calculate duration from last segment
     duration = segments[-1].end if segments else 0.0
     
     transcript = Transcript(
         segments=segments,
-        language=result.get("language", "en"),
+        language=detected_language,
         duration=duration
     )
     
@@ -194,7 +524,8 @@ def transcribe_video(
     video_path: Path,
     output_dir: Path,
     model_name: str = "base",
-    language: Optional[str] = None
+    language: Optional[str] = None,
+    backend: str = "auto"
 ) -> Transcript:
     """
     Full pipeline: extract audio from video and transcribe.
@@ -204,18 +535,18 @@ def transcribe_video(
         output_dir: Directory to save intermediate and final files
         model_name: Whisper model size
         language: Optional language code
+        backend: Whisper backend, see transcribe_audio
     
     Returns:
         Transcript object
     """
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Extract audio
-    audio_path = output_dir / f"{video_path.stem}_audio.wav"
-    extract_audio(video_path, audio_path)
+    # Decode audio in memory (no intermediate WAV)
+    audio = load_audio_array(video_path)
     
     # Transcribe
-    transcript = transcribe_audio(audio_path, model_name, language)
+    transcript = transcribe_audio(audio, model_name, language, backend)
     
     # Save transcript
     transcript_path = output_dir / f"{video_path.stem}_transcript.json"